@@ -1,28 +1,41 @@
+import itertools
+import math
+import os
+import queue
+import shutil
 import sqlite3
+import tempfile
+import threading
 import mysql.connector
+from mysql.connector import errorcode
 import re # For regular expressions to parse types
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from urllib.request import pathname2url
+
+# Matches the length argument of declared types such as VARCHAR(150)
+_VARCHAR_LEN_RE = re.compile(r'\((\d+)\)')
+
+# Table names that must be backquoted in SQLite PRAGMA and SELECT statements
+_SQLITE_KEYWORD_TABLE_NAMES = frozenset({'group', 'order', 'key', 'index', 'table'})
 
 def escape_mysql_reserved_words(table_name):
     """
     Escapes MySQL reserved words by wrapping them in backticks.
+    Every name is wrapped, so reserved words never need to be looked up.
     """
-    mysql_reserved_words = {
-        'group', 'order', 'key', 'index', 'table', 'database', 'column',
-        'primary', 'foreign', 'unique', 'check', 'constraint', 'references',
-        'add', 'alter', 'create', 'drop', 'insert', 'update', 'delete',
-        'select', 'from', 'where', 'join', 'inner', 'left', 'right',
-        'union', 'distinct', 'having', 'limit', 'offset', 'desc', 'asc'
-    }
-    
-    if table_name.lower() in mysql_reserved_words:
-        return f"`{table_name}`"
-    return f"`{table_name}`"  # Always use backticks for safety
+    return f"`{table_name}`"
 
+@lru_cache(maxsize=512)
 def map_sqlite_to_mysql_type(sqlite_type_raw, is_primary_key=False, is_unique=False):
     """
     Maps SQLite data types to appropriate MySQL data types.
     `is_unique` is used to identify columns that will form part of a unique index.
+    Results are memoized since schemas reuse a small set of declared types,
+    so mapping warnings are printed once per distinct type. Types are matched
+    by substring, in the same order as SQLite's own type affinity rules, so
+    names like "UNSIGNED BIG INT" or "NATIVE CHARACTER(70)" map correctly.
     """
     sqlite_type = sqlite_type_raw.upper()
 
@@ -44,7 +57,7 @@ def map_sqlite_to_mysql_type(sqlite_type_raw, is_primary_key=False, is_unique=Fa
             print(f"Warning: Indexed text column '{sqlite_type_raw}' mapped to VARCHAR({max_varchar_len_for_index}) for index compatibility due to MySQL's 767-byte limit (on older versions/default configs). Ensure data fits.")
             return f"VARCHAR({max_varchar_len_for_index})"
         
-        match = re.search(r'\((\d+)\)', sqlite_type_raw)
+        match = _VARCHAR_LEN_RE.search(sqlite_type_raw)
         if match:
             length = int(match.group(1))
             # For non-indexed, we can use a larger VARCHAR if needed, up to MySQL's limit (65535 bytes)
@@ -77,9 +90,164 @@ def map_sqlite_to_mysql_type(sqlite_type_raw, is_primary_key=False, is_unique=Fa
         return "VARCHAR(255)"
 
 # Types that cannot have DEFAULT values on MySQL (but can on MariaDB)
-# Listed in order from most specific to least specific to avoid substring matching issues
+# Matched against the base type name, so LONGTEXT never matches TEXT by substring
 # Note: SQLite TEXT typically maps to MySQL LONGTEXT via map_sqlite_to_mysql_type()
-MYSQL_NO_DEFAULT_TYPES = ["LONGTEXT", "TEXT", "BLOB", "JSON", "GEOMETRY"]
+MYSQL_NO_DEFAULT_TYPES = frozenset({
+    "TINYTEXT", "TEXT", "MEDIUMTEXT", "LONGTEXT",
+    "TINYBLOB", "BLOB", "MEDIUMBLOB", "LONGBLOB",
+    "JSON", "GEOMETRY"
+})
+
+# Types MySQL can only index by a prefix, and the prefix used (191 * 4 bytes
+# fits the 767-byte key limit of older utf8mb4 setups). Longer VARCHARs get
+# the same prefix.
+MYSQL_PREFIX_INDEX_TYPES = frozenset({
+    "TINYTEXT", "TEXT", "MEDIUMTEXT", "LONGTEXT",
+    "TINYBLOB", "BLOB", "MEDIUMBLOB", "LONGBLOB",
+})
+INDEX_PREFIX_LENGTH = 191
+
+def index_key_part(col_name, mysql_type):
+    """
+    Returns the key part of `col_name` in a secondary index, indexing only a
+    prefix of columns that could exceed the 767-byte key limit.
+    """
+    base_type, _, length = mysql_type.partition('(')
+    if base_type in MYSQL_PREFIX_INDEX_TYPES or (base_type == "VARCHAR" and int(length.rstrip(')')) > INDEX_PREFIX_LENGTH):
+        return f"`{col_name}`({INDEX_PREFIX_LENGTH})"
+    return f"`{col_name}`"
+
+# SQLite defaults that translate to DEFAULT CURRENT_TIMESTAMP (compared upper-cased, single-quoted)
+_TIMESTAMP_DEFAULTS = frozenset({"DATETIME('NOW')", "CURRENT_TIMESTAMP", "'CURRENT_TIMESTAMP'"})
+# SQLite defaults that translate to DEFAULT NULL (compared upper-cased)
+_NULL_DEFAULTS = frozenset({"'NULL'", "NULL"})
+
+# SQL numeric literal grammar. float() also accepts Python-only forms such as
+# '1_000', non-ASCII digits and padding, which MySQL rejects in DDL.
+_NUMERIC_LITERAL_RE = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?', re.ASCII)
+
+def _is_numeric_literal(value):
+    """
+    Returns True if a SQLite default value is a finite number, including
+    signed and scientific-notation literals such as '-1.5' or '1e3'.
+    """
+    if isinstance(value, (int, float)):
+        return True
+    if not isinstance(value, str) or not _NUMERIC_LITERAL_RE.fullmatch(value):
+        return False
+    return math.isfinite(float(value))
+
+def unwrap_default_parens(value):
+    """
+    Removes parentheses wrapping a whole SQLite default, so DEFAULT (0) or
+    DEFAULT ('GET') are treated like the plain literals 0 and 'GET'.
+    """
+    while isinstance(value, str) and value.startswith('(') and value.endswith(')'):
+        depth = 0
+        for i, char in enumerate(value):
+            depth += {'(': 1, ')': -1}.get(char, 0)
+            if depth == 0 and i < len(value) - 1:
+                return value # The first parenthesis closes early, e.g. (a) + (b)
+        value = value[1:-1].strip()
+    return value
+
+def _is_expression_default(value):
+    """
+    Returns True for a SQLite default that is an unquoted expression such as
+    strftime('%s', 'now'), which cannot be copied into MySQL DDL as is.
+    """
+    return isinstance(value, str) and not value.startswith(("'", '"')) and '(' in value
+
+def should_skip_default_for_mysql(mysql_type, is_mysql):
+    """
+    Returns True if `mysql_type` cannot carry a DEFAULT value on the target server.
+    `mysql_type` is expected in upper case, as produced by map_sqlite_to_mysql_type().
+    """
+    return is_mysql and mysql_type.partition('(')[0].partition(' ')[0] in MYSQL_NO_DEFAULT_TYPES
+
+# Rows fetched for the first batch of a table, used to estimate the row size
+INITIAL_BATCH_SIZE = 1000
+# Upper bound on rows per multi-row INSERT statement. MySQL keeps getting faster
+# well past 1000 rows per statement, so batches grow as far as the packet allows.
+MAX_BATCH_SIZE = 50000
+# Share of max_allowed_packet a single statement may use, leaving headroom for
+# escaping and rows larger than the estimate
+PACKET_BUDGET_RATIO = 0.75
+# Server limit on placeholders in one prepared statement
+MAX_PREPARED_PLACEHOLDERS = 65535
+# Number of tables whose data is copied concurrently, each over its own connections.
+# One per core, capped so small servers are not flooded with connections.
+DEFAULT_WORKERS = min(8, os.cpu_count() or 4)
+# Batches the SQLite reader may prepare ahead of the MySQL writer
+READ_AHEAD_BATCHES = 4
+# Fallback when max_allowed_packet cannot be read (MySQL 5.7 default)
+DEFAULT_MAX_ALLOWED_PACKET = 4 * 1024 * 1024
+
+def get_max_allowed_packet(mysql_cursor):
+    """
+    Returns the server's max_allowed_packet in bytes, which bounds the size
+    of a single multi-row INSERT statement.
+    """
+    try:
+        mysql_cursor.execute("SHOW VARIABLES LIKE 'max_allowed_packet'")
+        row = mysql_cursor.fetchone()
+        max_packet = int(row[1])
+    except mysql.connector.Error as e:
+        print(f"Warning: Could not read max_allowed_packet: {e}. Assuming {DEFAULT_MAX_ALLOWED_PACKET} bytes.")
+        return DEFAULT_MAX_ALLOWED_PACKET
+    except (TypeError, ValueError, IndexError) as e:
+        print(f"Warning: Unexpected max_allowed_packet value: {e}. Assuming {DEFAULT_MAX_ALLOWED_PACKET} bytes.")
+        return DEFAULT_MAX_ALLOWED_PACKET
+    if max_packet < 1024: # Below the server's own minimum, not a real setting
+        return DEFAULT_MAX_ALLOWED_PACKET
+    print(f"Server max_allowed_packet: {max_packet} bytes")
+    return max_packet
+
+def is_local_infile_enabled(mysql_cursor):
+    """
+    Returns True if the server accepts LOAD DATA LOCAL INFILE, which loads
+    table data much faster than INSERT statements.
+    """
+    try:
+        mysql_cursor.execute("SHOW VARIABLES LIKE 'local_infile'")
+        row = mysql_cursor.fetchone()
+        enabled = str(row[1]).upper() in ('ON', '1')
+    except mysql.connector.Error as e:
+        print(f"Warning: Could not read local_infile: {e}. Using INSERT statements.")
+        return False
+    except (TypeError, IndexError):
+        return False
+    if not enabled:
+        print("Server has local_infile disabled, using INSERT statements to copy data.")
+    return enabled
+
+def estimate_row_bytes(row):
+    """
+    Roughly estimates how many bytes a row adds to a multi-row INSERT statement.
+    It runs for every row, so no strings are built: text and binary values
+    count their length, NULL and numbers a fixed size.
+    """
+    size = len(row) + 3 # separators and parentheses
+    for value in row:
+        value_type = type(value)
+        if value_type is bytes or value_type is str:
+            size += len(value)
+        elif value is None:
+            size += 4
+        else:
+            size += 8 # prepared statements send numbers as fixed-size binary values
+    return size
+
+def compute_batch_size(sample_rows, max_allowed_packet):
+    """
+    Returns how many rows fit in one multi-row INSERT, based on the largest
+    row of the sample and the usable share of max_allowed_packet. Statements
+    are prepared, so the rows' placeholders must also stay within the server limit.
+    """
+    packet_budget = int(max_allowed_packet * PACKET_BUDGET_RATIO)
+    est_row_bytes = max(estimate_row_bytes(row) for row in sample_rows)
+    max_rows = min(MAX_BATCH_SIZE, MAX_PREPARED_PLACEHOLDERS // len(sample_rows[0]))
+    return min(max_rows, max(1, packet_budget // est_row_bytes))
 
 def is_mysql_server(mysql_cursor):
     """
@@ -102,36 +270,628 @@ def is_mysql_server(mysql_cursor):
         print(f"Warning: Unexpected error detecting server type: {e}. Assuming MySQL for safety.")
         return True  # Default to MySQL for safety (stricter rules)
 
-def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
+# Hosts served over the loopback interface, where compression only costs CPU
+LOCAL_MYSQL_HOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+def build_mysql_connect_config(mysql_config, staging_dir=None):
+    """
+    Returns the keyword arguments passed to mysql.connector.connect().
+    Prefers the bundled C extension, which encodes parameters natively and is
+    noticeably faster for bulk inserts. Remote targets get protocol compression
+    and a longer connect timeout. TLS is left to `mysql_config`: MySQL 8's
+    caching_sha2_password needs it (or a Unix socket) for a full authentication.
+    With a `staging_dir`, LOAD DATA LOCAL INFILE may read files from that
+    directory only. Explicit settings in `mysql_config` win.
+    """
+    connect_config = dict(mysql_config)
+    connect_config.setdefault('autocommit', False)
+    if staging_dir:
+        connect_config.setdefault('allow_local_infile_in_path', staging_dir)
+    if connect_config.get('host', 'localhost') not in LOCAL_MYSQL_HOSTS:
+        connect_config.setdefault('compress', True)
+        connect_config.setdefault('connection_timeout', 300)
+    if mysql.connector.HAVE_CEXT:
+        connect_config.setdefault('use_pure', False)
+    return connect_config
+
+# knex stores migration_time as a Unix timestamp; MySQL expects DATETIME text
+KNEX_MIGRATION_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def convert_knex_migration_time(migration_time):
+    """
+    Converts a knex_migrations Unix timestamp (seconds or milliseconds) to
+    MySQL DATETIME format in local time. Non-numeric values are returned unchanged.
+    """
+    if isinstance(migration_time, bytes): # TEXT values read with text_factory=bytes
+        migration_time = migration_time.decode('utf-8', 'replace')
+    if not migration_time or not str(migration_time).isdigit():
+        return migration_time
+    # Convert from milliseconds to seconds if needed
+    timestamp_val = int(migration_time)
+    if timestamp_val > 4000000000:  # If > year 2096, likely milliseconds
+        timestamp_val = timestamp_val // 1000
+    try:
+        return datetime.fromtimestamp(timestamp_val).strftime(KNEX_MIGRATION_TIME_FORMAT)
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not convert timestamp {migration_time}: {e}")
+        return None
+
+def normalize_rows(table_name, rows):
+    """
+    Applies per-table value fixups to a batch of SQLite rows before they are
+    inserted into MySQL. Tables without fixups get the same list back.
+    """
+    # Handle timestamp conversion for knex_migrations table (migration_time column)
+    if table_name == 'knex_migrations':
+        return [row[:3] + (convert_knex_migration_time(row[3]),) + row[4:] if len(row) >= 4 else row
+                for row in rows]
+    return rows
+
+def _put_unless_stopped(batch_queue, item, stop_event):
+    """
+    Puts `item` on the queue, giving up once `stop_event` is set so a reader
+    never blocks forever on a writer that has stopped consuming.
+    """
+    while not stop_event.is_set():
+        try:
+            batch_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+def read_table_batches(sqlite_cursor, table_name, column_list, pk_col_list, insert_stmt, max_allowed_packet,
+                       batch_queue, stop_event, start_after=None, log=print):
+    """
+    Reader side of the copy pipeline: streams rows of `table_name` from SQLite,
+    normalizes them and puts statement-sized batches on `batch_queue`.
+    The row count of a batch is sized from the first rows, and every batch
+    is also closed early once its own rows would exceed the packet budget,
+    so wider rows later in the table still fit in one packet.
+    `column_list` is the same quoted column list the INSERT uses, so every
+    row has exactly one value per placeholder. Rows are read in primary key
+    order (`pk_col_list`), so InnoDB appends to its clustered index instead of
+    splitting pages. With `start_after` = (column, value), only rows whose
+    column is greater than value are read. A final None marks the end of the table.
+    Progress messages go to `log`.
+    """
+    try:
+        # Handle reserved keywords in SQLite SELECT queries
+        if table_name.lower() in _SQLITE_KEYWORD_TABLE_NAMES:
+            select_stmt = f"SELECT {column_list} FROM `{table_name}`"
+        else:
+            select_stmt = f"SELECT {column_list} FROM {table_name}"
+        select_params = ()
+        if start_after:
+            select_stmt += f" WHERE `{start_after[0]}` > ?"
+            select_params = (start_after[1],)
+        if pk_col_list:
+            select_stmt += f" ORDER BY {pk_col_list}"
+        sqlite_cursor.execute(select_stmt, select_params)
+
+        packet_budget = int(max_allowed_packet * PACKET_BUDGET_RATIO)
+        batch_size = INITIAL_BATCH_SIZE
+        first_fetch = True
+        batch = []
+        batch_bytes = 0
+        while not stop_event.is_set():
+            rows = sqlite_cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            processed_rows = normalize_rows(table_name, rows)
+            if first_fetch:
+                # Size batches so one multi-row INSERT stays below max_allowed_packet
+                batch_size = compute_batch_size(processed_rows, max_allowed_packet)
+                log(f"Copying rows to `{table_name}` using: {insert_stmt} (up to {batch_size} rows per statement)")
+                first_fetch = False
+
+            for row in processed_rows:
+                row_bytes = estimate_row_bytes(row)
+                if batch and (len(batch) == batch_size or batch_bytes + row_bytes > packet_budget):
+                    _put_unless_stopped(batch_queue, batch, stop_event)
+                    batch = []
+                    batch_bytes = 0
+                batch.append(row)
+                batch_bytes += row_bytes
+        if batch:
+            _put_unless_stopped(batch_queue, batch, stop_event)
+    finally:
+        _put_unless_stopped(batch_queue, None, stop_event)
+
+def _is_splittable_insert_error(err):
+    """
+    Returns True for errors caused by the rows of a statement rather than by
+    the table or connection, so retrying fewer rows can succeed. INSERT IGNORE
+    already turns duplicate keys, NULLs in NOT NULL columns and bad, out of
+    range or too long values into warnings, so what reaches here are the row
+    errors a server does not downgrade. The connector raises DataError for
+    SQLSTATE 22xxx (e.g. 1406 Data too long) and IntegrityError for 23xxx
+    (e.g. 1062 Duplicate entry); errors with SQLSTATE HY000, such as 1366
+    Incorrect integer value, arrive as DatabaseError and are not split.
+    Oversized packets are not split either: the server closes the connection,
+    so batches are kept below max_allowed_packet by the reader instead.
+    """
+    return isinstance(err, (mysql.connector.DataError, mysql.connector.IntegrityError))
+
+# Statements for full batches can be large, so only the recent ones are kept
+@lru_cache(maxsize=64)
+def build_insert_statement(table_name, column_list, column_count, row_count):
+    """
+    Returns the multi-row INSERT for `row_count` rows. Full-size batches of a
+    table share one cached statement text; only the tail and split retries
+    need another.
+    """
+    # Use INSERT IGNORE to skip duplicate key errors and continue processing
+    row_placeholders = f"({','.join(['%s'] * column_count)})"
+    return (f"INSERT IGNORE INTO {escape_mysql_reserved_words(table_name)} ({column_list}) VALUES "
+            + ','.join([row_placeholders] * row_count))
+
+def insert_batch(mysql_cursor, insert_cursor, table_name, column_list, batch, start_row, log=print):
+    """
+    Inserts one batch as a multi-row INSERT under a savepoint. The INSERT runs
+    on the prepared `insert_cursor`, which only prepares a statement again when
+    the row count changes; savepoints use the plain `mysql_cursor` so they do
+    not evict it. When the batch is rejected because of its rows, it is split
+    in halves and retried, so only the offending rows are skipped.
+    Returns the number of skipped rows; errors are reported to `log`.
+    """
+    skipped_rows = 0
+    pending = [(start_row, batch)]
+    while pending:
+        first_row, rows = pending.pop()
+        try:
+            mysql_cursor.execute("SAVEPOINT batch_start")
+            insert_stmt = build_insert_statement(table_name, column_list, len(rows[0]), len(rows))
+            # Flattened in C rather than with a per-value Python loop
+            insert_cursor.execute(insert_stmt, list(itertools.chain.from_iterable(rows)))
+            mysql_cursor.execute("RELEASE SAVEPOINT batch_start")
+        except mysql.connector.Error as err:
+            mysql_cursor.execute("ROLLBACK TO SAVEPOINT batch_start")
+            if len(rows) > 1 and _is_splittable_insert_error(err):
+                if first_row == start_row and len(rows) == len(batch):
+                    log(f"Error inserting data into `{table_name}` (starting row {start_row}): {err}. Retrying in smaller batches.")
+                middle = len(rows) // 2
+                # Pushed in reverse so the first half is retried first
+                pending.append((first_row + middle, rows[middle:]))
+                pending.append((first_row, rows[:middle]))
+            else:
+                log(f"Error inserting data into `{table_name}` ({len(rows)} rows starting at row {first_row}), skipping: {err}")
+                skipped_rows += len(rows)
+    return skipped_rows
+
+# Escape sequences understood by LOAD_DATA_FORMAT; the backslash goes first
+_LOAD_DATA_ESCAPES = ((b'\\', b'\\\\'), (b'"', b'\\"'), (b'\n', b'\\n'), (b'\r', b'\\r'), (b'\0', b'\\0'))
+LOAD_DATA_FORMAT = "FIELDS TERMINATED BY ',' ENCLOSED BY '\"' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"
+
+def encode_load_data_value(value):
+    """
+    Encodes one value as a field of a LOAD DATA file in LOAD_DATA_FORMAT.
+    Text and binary values are quoted and escaped, NULL becomes an unquoted \\N.
+    """
+    if value is None:
+        return b'\\N'
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    elif not isinstance(value, bytes):
+        return str(value).encode('ascii')
+    for raw, escaped in _LOAD_DATA_ESCAPES:
+        value = value.replace(raw, escaped)
+    return b'"' + value + b'"'
+
+def load_data_infile(mysql_cursor, table_name, column_list, batches, staging_dir):
+    """
+    Writes `batches` to a data file in `staging_dir` and loads it into the
+    MySQL table with a single LOAD DATA LOCAL INFILE, which skips the SQL
+    parser entirely. Returns the number of rows written.
+    """
+    escaped_table_name = escape_mysql_reserved_words(table_name)
+    total_rows = 0
+    data_file = tempfile.NamedTemporaryFile(dir=staging_dir, prefix=f"{table_name}-", suffix='.csv', delete=False)
+    try:
+        with data_file:
+            for batch in batches:
+                data_file.write(b''.join(b','.join(map(encode_load_data_value, row)) + b'\n'
+                                         for row in batch))
+                total_rows += len(batch)
+        # IGNORE skips duplicate keys like INSERT IGNORE does; the file is
+        # already UTF-8, so the server must not convert it again
+        mysql_cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {escaped_table_name} CHARACTER SET binary "
+            f"{LOAD_DATA_FORMAT} ({column_list})", (data_file.name,))
+    finally:
+        os.remove(data_file.name)
+    return total_rows
+
+def _iter_batches(batch_queue):
+    """
+    Yields batches from the reader's queue until its end-of-table marker.
+    """
+    while True:
+        batch = batch_queue.get()
+        if batch is None:
+            return
+        yield batch
+
+def migrate_table_data(sqlite_cursor, mysql_conn, mysql_cursor, insert_cursor, table_name, col_names, pk_col_names,
+                       max_allowed_packet, staging_dir=None, resume_key=None, log=print):
+    """
+    Copies all rows of `table_name` from SQLite into the already created MySQL table.
+    SQLite reads run in a background thread feeding a bounded queue, so fetching
+    the next batch overlaps with MySQL executing the current one. INSERTs run on
+    the prepared `insert_cursor`, the rest on `mysql_cursor`. Tables spanning
+    more than one batch go through LOAD DATA LOCAL INFILE when a `staging_dir`
+    is given; smaller tables are sent as multi-row INSERTs. With a `resume_key`
+    (an integer primary key column), only rows above the largest key already
+    in MySQL are copied. Progress messages go to `log`.
+    """
+    column_list = ','.join(f'`{col}`' for col in col_names)
+    pk_col_list = ','.join(f'`{col}`' for col in pk_col_names)
+    insert_stmt = build_insert_statement(table_name, column_list, len(col_names), 1)
+
+    # All batches of a table share one transaction; each batch runs under a
+    # savepoint so a failing batch is undone without losing earlier ones.
+    mysql_conn.start_transaction()
+    start_after = None
+    if resume_key:
+        mysql_cursor.execute(f"SELECT MAX(`{resume_key}`) FROM {escape_mysql_reserved_words(table_name)}")
+        max_rows = mysql_cursor.fetchall()
+        if max_rows and max_rows[0][0] is not None:
+            start_after = (resume_key, max_rows[0][0])
+            log(f"Resuming `{table_name}` after `{resume_key}` = {start_after[1]}")
+    batch_number = 0
+    successful_batches = 0
+    total_rows = 0
+    skipped_rows = 0
+    batch_queue = queue.Queue(maxsize=READ_AHEAD_BATCHES)
+    stop_event = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        reader = executor.submit(read_table_batches, sqlite_cursor, table_name, column_list, pk_col_list, insert_stmt,
+                                 max_allowed_packet, batch_queue, stop_event, start_after, log)
+        try:
+            batches = _iter_batches(batch_queue)
+            # Look ahead one batch to tell whether the table is worth a data file
+            first_batches = list(itertools.islice(batches, 2))
+            if staging_dir and len(first_batches) > 1:
+                total_rows = load_data_infile(mysql_cursor, table_name, column_list,
+                                              itertools.chain(first_batches, batches), staging_dir)
+            else:
+                for batch in itertools.chain(first_batches, batches):
+                    batch_skipped = insert_batch(mysql_cursor, insert_cursor, table_name, column_list, batch, total_rows,
+                                                 log)
+                    if not batch_skipped:
+                        successful_batches += 1
+                    skipped_rows += batch_skipped
+                    batch_number += 1
+                    total_rows += len(batch)
+        finally:
+            # Release the reader if the writer stopped early
+            stop_event.set()
+        reader.result() # Re-raise any SQLite error from the reader thread
+
+    mysql_conn.commit()
+
+    if total_rows and not batch_number:
+        log(f"Loaded {total_rows} rows into `{table_name}` with LOAD DATA LOCAL INFILE")
+        log(f"Data copied to `{table_name}`.")
+    elif batch_number:
+        skipped_info = f", {skipped_rows} skipped" if skipped_rows else ""
+        log(f"Successfully processed {successful_batches} batches out of {batch_number} for table `{table_name}` ({total_rows} rows{skipped_info})")
+        log(f"Data copied to `{table_name}`.")
+    else:
+        log(f"No data to copy for table `{table_name}`.")
+
+def rebuild_with_indexes(mysql_cursor, table_name, index_defs, pk_col_names):
+    """
+    Fallback for deferred UNIQUE indexes rejected because of duplicate rows:
+    copies the table into a new one that already has `index_defs`, so INSERT
+    IGNORE keeps the first row of each duplicate as the inline UNIQUE keys
+    did before indexes were deferred. Returns the number of rows dropped.
+    """
+    escaped_table_name = escape_mysql_reserved_words(table_name)
+    rebuilt_table_name = escape_mysql_reserved_words(f"{table_name}__rebuild")
+    old_table_name = escape_mysql_reserved_words(f"{table_name}__old")
+    order_by = f" ORDER BY {','.join(f'`{col}`' for col in pk_col_names)}" if pk_col_names else ""
+
+    mysql_cursor.execute(f"DROP TABLE IF EXISTS {rebuilt_table_name};")
+    mysql_cursor.execute(f"CREATE TABLE {rebuilt_table_name} LIKE {escaped_table_name};")
+    mysql_cursor.execute(f"ALTER TABLE {rebuilt_table_name} "
+                         + ', '.join(f"ADD {index_def}" for index_def in index_defs) + ";")
+    mysql_cursor.execute(f"SELECT COUNT(*) FROM {escaped_table_name}")
+    source_rows = mysql_cursor.fetchone()[0]
+    mysql_cursor.execute(f"INSERT IGNORE INTO {rebuilt_table_name} SELECT * FROM {escaped_table_name}{order_by};")
+    copied_rows = mysql_cursor.rowcount
+    # RENAME TABLE commits the copy and swaps both tables atomically
+    mysql_cursor.execute(f"RENAME TABLE {escaped_table_name} TO {old_table_name}, "
+                         f"{rebuilt_table_name} TO {escaped_table_name};")
+    mysql_cursor.execute(f"DROP TABLE {old_table_name};")
+    return source_rows - copied_rows
+
+def add_unique_indexes(mysql_cursor, table_name, index_defs, pk_col_names, log=print):
+    """
+    Adds the UNIQUE indexes held back from CREATE TABLE to a loaded table.
+    All of them go into one ALTER TABLE so InnoDB builds them in a single pass.
+    Indexes are named, so when resuming into a table that already has them the
+    ALTER fails as a whole and is reported as already done. Rows that only
+    collide once loaded (e.g. under a case-insensitive collation) are dropped
+    by rebuild_with_indexes() and reported to `log`; any other failure is
+    raised to the caller.
+    """
+    if not index_defs:
+        return
+    escaped_table_name = escape_mysql_reserved_words(table_name)
+    alter_stmt = f"ALTER TABLE {escaped_table_name} " + ', '.join(f"ADD {index_def}" for index_def in index_defs) + ";"
+    try:
+        mysql_cursor.execute(alter_stmt)
+        log(f"Added {len(index_defs)} index(es) to `{table_name}`: {alter_stmt}")
+    except mysql.connector.Error as err:
+        if err.errno == errorcode.ER_DUP_KEYNAME:
+            log(f"Indexes of `{table_name}` already exist, skipping.")
+            return
+        if err.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        log(f"Warning: `{table_name}` has rows that duplicate a UNIQUE key in MySQL ({err}). Rebuilding the table without them.")
+        dropped_rows = rebuild_with_indexes(mysql_cursor, table_name, index_defs, pk_col_names)
+        log(f"Warning: Dropped {dropped_rows} duplicate row(s) from `{table_name}` and added {len(index_defs)} index(es).")
+
+def add_secondary_indexes(mysql_cursor, table_name, index_defs, log=print):
+    """
+    Adds the non-unique indexes held back from CREATE TABLE to a loaded table,
+    on a best-effort basis: they only speed up queries, so a failing index is
+    reported to `log` and skipped. They are tried in one ALTER TABLE first,
+    and one by one if that fails, so one bad index does not take down the others.
+    """
+    if not index_defs:
+        return
+    escaped_table_name = escape_mysql_reserved_words(table_name)
+    alter_stmt = f"ALTER TABLE {escaped_table_name} " + ', '.join(f"ADD {index_def}" for index_def in index_defs) + ";"
+    try:
+        mysql_cursor.execute(alter_stmt)
+        log(f"Added {len(index_defs)} index(es) to `{table_name}`: {alter_stmt}")
+        return
+    except mysql.connector.Error as err:
+        if err.errno == errorcode.ER_DUP_KEYNAME:
+            log(f"Indexes of `{table_name}` already exist, skipping.")
+            return
+        log(f"Warning: Could not add indexes to `{table_name}` together ({err}). Adding them one by one.")
+    for index_def in index_defs:
+        try:
+            mysql_cursor.execute(f"ALTER TABLE {escaped_table_name} ADD {index_def};")
+            log(f"Added index to `{table_name}`: {index_def}")
+        except mysql.connector.Error as err:
+            if err.errno != errorcode.ER_DUP_KEYNAME:
+                log(f"Warning: Skipping index {index_def} on `{table_name}`: {err}")
+
+def read_sqlite_schema(sqlite_cursor):
+    """
+    Reads the columns and indexes of every table with a few queries over the
+    pragma table-valued functions, instead of several PRAGMA statements per table.
+    Returns ({table: [table_info rows]}, {table: {single-column UNIQUE column names}},
+    {table: {non-unique index name: [column names]}}).
+    """
+    columns_by_table = {}
+    sqlite_cursor.execute(
+        "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+        "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+        "WHERE m.type = 'table' ORDER BY m.name, p.cid;")
+    for row in sqlite_cursor.fetchall():
+        columns_by_table.setdefault(row[0], []).append(row[1:])
+
+    # Only single-column indexes are treated as column-level UNIQUE
+    unique_cols_by_table = {}
+    sqlite_cursor.execute(
+        "SELECT m.name, MIN(ii.name) "
+        "FROM sqlite_master m JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii "
+        "WHERE m.type = 'table' AND il.\"unique\" = 1 "
+        "GROUP BY m.name, il.name HAVING COUNT(*) = 1;")
+    for table_name, col_name in sqlite_cursor.fetchall():
+        unique_cols_by_table.setdefault(table_name, set()).add(col_name)
+
+    # Indexes on expressions have no column name and are not migrated
+    indexes_by_table = {}
+    sqlite_cursor.execute(
+        "SELECT m.name, il.name, ii.name "
+        "FROM sqlite_master m JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii "
+        "WHERE m.type = 'table' AND il.\"unique\" = 0 "
+        "ORDER BY m.name, il.name, ii.seqno;")
+    expression_indexes = set()
+    for table_name, index_name, col_name in sqlite_cursor.fetchall():
+        if col_name is None:
+            expression_indexes.add((table_name, index_name))
+        indexes_by_table.setdefault(table_name, {}).setdefault(index_name, []).append(col_name)
+    for table_name, index_name in expression_indexes:
+        print(f"Warning: Skipping index `{index_name}` on `{table_name}`: expression indexes are not supported.")
+        del indexes_by_table[table_name][index_name]
+    return columns_by_table, unique_cols_by_table, indexes_by_table
+
+# Memory-mapped reads (SQLite caps the size at its compile-time limit), a
+# 256 MiB page cache and in-memory temp storage for any sorting SQLite needs to do
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA mmap_size = 1099511627776;",
+    "PRAGMA cache_size = -262144;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA query_only = 1;",
+)
+
+def connect_sqlite(sqlite_db_path):
+    """
+    Opens the SQLite source database read-only, tuned for large sequential scans.
+    The connection may be used from the reader thread of migrate_table_data().
+    """
+    # Open read-only: the migration never writes to the source database
+    sqlite_uri = f"file:{pathname2url(os.path.abspath(sqlite_db_path))}?mode=ro"
+    sqlite_conn = sqlite3.connect(sqlite_uri, uri=True, isolation_level=None, check_same_thread=False)
+    for pragma in SQLITE_READ_PRAGMAS:
+        sqlite_conn.execute(pragma)
+    return sqlite_conn
+
+def set_foreign_key_checks(mysql_cursor, enabled):
+    """
+    Turns the session's foreign key checks on or off, so tables can be loaded
+    in any order. Session settings are per connection, so every worker sets
+    them itself and restores them before its connection is released.
+    unique_checks is left on: UNIQUE indexes are only added after the load,
+    and primary keys are checked regardless.
+    """
+    value = 1 if enabled else 0
+    mysql_cursor.execute(f"SET SESSION foreign_key_checks = {value};")
+
+# Serializes the per-table output of the data-copy workers
+_OUTPUT_LOCK = threading.Lock()
+
+def connect_mysql_worker(mysql_config, staging_dir=None):
+    """
+    Opens a data-copy worker's MySQL connection with foreign key checks off.
+    Returns (connection, plain cursor, prepared INSERT cursor).
+    """
+    mysql_conn = mysql.connector.connect(**build_mysql_connect_config(mysql_config, staging_dir))
+    mysql_cursor = mysql_conn.cursor()
+    # One prepared cursor serves every table; batches only ship their
+    # parameters over the binary protocol
+    insert_cursor = mysql_conn.cursor(prepared=True)
+    set_foreign_key_checks(mysql_cursor, enabled=False)
+    return mysql_conn, mysql_cursor, insert_cursor
+
+def close_mysql_worker(mysql_conn, mysql_cursor, insert_cursor):
+    """
+    Restores foreign key checks and closes a worker's MySQL connection.
+    Errors are reported rather than raised, since the server may already
+    have closed the connection.
+    """
+    try:
+        set_foreign_key_checks(mysql_cursor, enabled=True)
+    except mysql.connector.Error as err:
+        with _OUTPUT_LOCK:
+            print(f"Error restoring foreign key checks: {err}")
+    for closable in (insert_cursor, mysql_cursor, mysql_conn):
+        try:
+            closable.close()
+        except mysql.connector.Error:
+            pass
+
+def load_tables(sqlite_db_path, mysql_config, table_queue, max_allowed_packet, staging_dir=None):
+    """
+    Data-copy worker: opens its own SQLite and MySQL connections (connections
+    must not be shared between threads) and loads tables from `table_queue`
+    until it is empty, reusing the same connections for every table. If the
+    server drops the MySQL connection while copying a table, the table is
+    reported as failed and the worker continues on a new connection.
+    Each entry is (table_name, col_names, pk_col_names, unique_indexes, secondary_indexes, resume_key).
+    Returns the names of the tables that could not be copied completely.
+    """
+    sqlite_conn = None
+    mysql_session = None
+    try:
+        sqlite_conn = connect_sqlite(sqlite_db_path)
+        # Values are passed straight through to MySQL, so TEXT is read as UTF-8
+        # bytes instead of being decoded to str and encoded again
+        sqlite_conn.text_factory = bytes
+        sqlite_cursor = sqlite_conn.cursor()
+        mysql_session = connect_mysql_worker(mysql_config, staging_dir)
+
+        failed_tables = []
+        while True:
+            try:
+                table_name, col_names, pk_col_names, unique_indexes, secondary_indexes, resume_key = table_queue.get_nowait()
+            except queue.Empty:
+                break
+            mysql_conn, mysql_cursor, insert_cursor = mysql_session
+            # Messages of one table are printed together once it is done,
+            # so the output of concurrent workers does not interleave
+            table_log = []
+            log = table_log.append
+            try:
+                migrate_table_data(sqlite_cursor, mysql_conn, mysql_cursor, insert_cursor, table_name, col_names,
+                                   pk_col_names, max_allowed_packet, staging_dir, resume_key, log)
+                add_unique_indexes(mysql_cursor, table_name, unique_indexes, pk_col_names, log)
+                add_secondary_indexes(mysql_cursor, table_name, secondary_indexes, log)
+            except (sqlite3.Error, mysql.connector.Error) as e:
+                log(f"Error copying data for table `{table_name}`: {e}")
+                failed_tables.append(table_name)
+                try:
+                    mysql_conn.rollback()
+                except mysql.connector.Error as err:
+                    log(f"Lost the MySQL connection ({err}), reconnecting.")
+                    close_mysql_worker(*mysql_session)
+                    mysql_session = None
+                    mysql_session = connect_mysql_worker(mysql_config, staging_dir)
+            finally:
+                with _OUTPUT_LOCK:
+                    print('\n'.join(table_log))
+        return failed_tables
+    finally:
+        if mysql_session:
+            close_mysql_worker(*mysql_session)
+        if sqlite_conn:
+            sqlite_conn.close()
+
+def load_tables_in_parallel(sqlite_db_path, mysql_config, tables_to_load, max_allowed_packet, workers,
+                            staging_dir=None):
+    """
+    Copies the data of all created tables using up to `workers` threads.
+    Foreign key checks are off, so tables have no ordering constraint; the
+    database drivers release the GIL while waiting on I/O, so threads suffice.
+    Returns the names of the tables that could not be copied completely.
+    """
+    if not tables_to_load:
+        return []
+    table_queue = queue.Queue()
+    for table in tables_to_load:
+        table_queue.put(table)
+    workers = max(1, min(workers, len(tables_to_load)))
+    print(f"\nCopying data for {len(tables_to_load)} tables using {workers} worker(s).")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(load_tables, sqlite_db_path, mysql_config, table_queue, max_allowed_packet,
+                                   staging_dir)
+                   for _ in range(workers)]
+        # Collects the failed tables and re-raises connection errors from the workers
+        return [table_name for future in futures for table_name in future.result()]
+
+def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config, workers=DEFAULT_WORKERS, resume=False):
     """
     Migrates a SQLite database to MySQL, including table schemas and data.
+    Tables are created one by one, then their data is copied by `workers`
+    threads, each with its own connections. With `resume`, existing MySQL
+    tables are kept and only rows missing from them are copied.
+    Returns True if every table was created and copied, False otherwise.
     """
     sqlite_conn = None
     mysql_conn = None
     sqlite_cursor = None
     mysql_cursor = None
+    failed_tables = [] # Tables that were not created or not copied completely
+    migration_error = False
 
     try:
-        sqlite_conn = sqlite3.connect(sqlite_db_path)
+        sqlite_conn = connect_sqlite(sqlite_db_path)
         sqlite_cursor = sqlite_conn.cursor()
         print(f"Connected to SQLite database: {sqlite_db_path}")
     except sqlite3.Error as e:
         print(f"Error connecting to SQLite: {e}")
-        return
+        return False
 
+    if not mysql.connector.HAVE_CEXT:
+        print("Info: mysql-connector C extension not available, using the pure Python implementation. "
+              "Reinstall mysql-connector-python from a binary wheel for faster inserts.")
     try:
-        mysql_conn = mysql.connector.connect(**mysql_config)
+        mysql_conn = mysql.connector.connect(**build_mysql_connect_config(mysql_config))
         mysql_cursor = mysql_conn.cursor()
         print(f"Connected to MySQL database: {mysql_config['database']}")
     except mysql.connector.Error as e:
         print(f"Error connecting to MySQL: {e}")
         if sqlite_cursor: sqlite_cursor.close()
         if sqlite_conn: sqlite_conn.close()
-        return
+        return False
 
     # Detect server type (MySQL vs MariaDB)
     is_mysql = is_mysql_server(mysql_cursor)
     
+    # Batches are sized so each multi-row INSERT fits in a single packet
+    max_allowed_packet = get_max_allowed_packet(mysql_cursor)
+
+    # Larger tables are staged as data files for LOAD DATA LOCAL INFILE
+    staging_dir = None
+    if is_local_infile_enabled(mysql_cursor):
+        staging_dir = tempfile.mkdtemp(prefix='sqlite3tomysql-')
+
     # Determined collation to use for CREATE TABLE
     # Default to utf8mb4_unicode_ci if not specified in config
     db_collation = mysql_config.get('collation', 'utf8mb4_unicode_ci')
@@ -148,6 +908,8 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
         sqlite_cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         tables = sqlite_cursor.fetchall()
         print(f"Found tables in SQLite: {[t[0] for t in tables]}")
+        columns_by_table, unique_cols_by_table, indexes_by_table = read_sqlite_schema(sqlite_cursor)
+        tables_to_load = [] # Created tables whose data is copied after the schema pass
 
         for table_name_tuple in tables:
             table_name = table_name_tuple[0]
@@ -163,13 +925,10 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
             # Escape reserved keywords
             escaped_table_name = escape_mysql_reserved_words(table_name)
 
-            # Handle reserved keywords in SQLite queries too
-            if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-                sqlite_cursor.execute(f"PRAGMA table_info(`{table_name}`);")
-            else:
-                sqlite_cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = sqlite_cursor.fetchall()
+            columns = columns_by_table.get(table_name, [])
             col_defs = []
+            unique_indexes = [] # UNIQUE indexes added after the data is loaded
+            secondary_indexes = [] # Non-unique indexes, also added after the data is loaded
             primary_keys = []
             unique_constraints = {} # Stores {col_name: unique_group_name} if composite unique
 
@@ -186,6 +945,9 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
             # For now, if a column is explicitly marked UNIQUE in the SQLite DDL, this will handle it.
             # The provided api_key DDL indicates client_name and key_hash are UNIQUE.
 
+            unique_cols = unique_cols_by_table.get(table_name, set())
+            mysql_types = {} # Final MySQL type per column, for index prefix lengths
+
             for col in columns:
                 col_name = col[1]
                 sqlite_type = col[2]
@@ -196,22 +958,7 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
                 # Determine if column has a UNIQUE constraint.
                 # This simple check is for single-column UNIQUE.
                 # For complex migrations, parsing CREATE statement is better.
-                is_unique_col = False
-                # Handle reserved keywords in SQLite queries
-                if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-                    sqlite_cursor.execute(f"PRAGMA index_list(`{table_name}`);")
-                else:
-                    sqlite_cursor.execute(f"PRAGMA index_list('{table_name}');")
-                indexes = sqlite_cursor.fetchall()
-                for idx in indexes:
-                    idx_name = idx[1]
-                    is_unique_idx = idx[2] # 1 for unique, 0 for not
-                    if is_unique_idx == 1:
-                        sqlite_cursor.execute(f"PRAGMA index_info('{idx_name}');")
-                        idx_cols = sqlite_cursor.fetchall()
-                        if len(idx_cols) == 1 and idx_cols[0][2] == col_name: # Check if single column index and matches current column
-                            is_unique_col = True
-                            break # Found a unique index for this column
+                is_unique_col = col_name in unique_cols
 
                 mysql_type = map_sqlite_to_mysql_type(
                     sqlite_type, 
@@ -232,49 +979,46 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
 
                 default_sql = ""
                 # Handle default values. Special case for created_at/updated_at to manage in app if needed.
-                if default_value is not None:
-                    # Check if this is a type that can't have DEFAULT on MySQL (but can on MariaDB)
-                    # Use startswith to avoid false positives (e.g., LONGTEXT shouldn't match TEXT alone)
-                    # The check is done in order from longest to shortest to match correctly
-                    skip_default_for_type = is_mysql and any(
-                        mysql_type.startswith(t) or mysql_type.split()[0] == t 
-                        for t in MYSQL_NO_DEFAULT_TYPES
-                    )
-                    
-                    if skip_default_for_type:
-                        print(f"Info: Skipping DEFAULT value for {mysql_type} column '{col_name}' on MySQL (not supported)")
+                if default_value is None:
+                    pass # Most columns have no default, so they skip the checks below
+                # Check if this is a type that can't have DEFAULT on MySQL (but can on MariaDB)
+                elif should_skip_default_for_mysql(mysql_type, is_mysql):
+                    print(f"Info: Skipping DEFAULT value for {mysql_type} column '{col_name}' on MySQL (not supported)")
+                else:
+                    default_value = unwrap_default_parens(default_value)
+                    # Fix for DATETIME('now') FUNCTION - convert SQLite syntax to MySQL
+                    default_upper = str(default_value).upper()
+                    default_str = default_upper.replace('"', "'")
+                    if default_str in _TIMESTAMP_DEFAULTS or "DATETIME('NOW')" in default_str:
+                        # For older MySQL/MariaDB versions, use TIMESTAMP instead of DATETIME with CURRENT_TIMESTAMP
+                        if mysql_type == "DATETIME":
+                            mysql_type = "TIMESTAMP"
+                        default_sql = " DEFAULT CURRENT_TIMESTAMP"
+                    # Handle 'NULL' string defaults
+                    elif default_upper in _NULL_DEFAULTS:
+                        default_sql = " DEFAULT NULL"
+                    # Handle numeric defaults but check for TINYINT overflow
+                    elif _is_numeric_literal(default_value):
+                        numeric_value = float(default_value)
+                        # Check for TINYINT overflow (range is -128 to 127, or 0 to 255 for unsigned)
+                        if "TINYINT" in mysql_type and (numeric_value > 127 or numeric_value < -128):
+                            print(f"Warning: Default value {default_value} for TINYINT column '{col_name}' exceeds TINYINT range. Converting column to SMALLINT.")
+                            mysql_type = mysql_type.replace("TINYINT", "SMALLINT")
+                        default_sql = f" DEFAULT {default_value}"
+                    # Specific handling for the 'api_key' table's timestamps if they need app management
+                    elif table_name == 'api_key' and col_name in ['created_at', 'updated_at']:
+                        # Skip default for 'created_at' as we'll populate it in INSERT
+                        # 'updated_at' will get ON UPDATE CURRENT_TIMESTAMP, not a DEFAULT
+                        pass
+                    elif _is_expression_default(default_value):
+                        print(f"Warning: Skipping DEFAULT expression {default_value} for column '{col_name}' in table '{table_name}' (not translatable to MySQL)")
+                    elif isinstance(default_value, str):
+                        # Handle string defaults for VARCHAR, DATE, TIME, and TEXT types (on MariaDB)
+                        # Note: TEXT/LONGTEXT would have been skipped above on MySQL
+                        default_value_clean = default_value.strip("'\"")
+                        default_sql = f" DEFAULT '{default_value_clean}'"
                     else:
-                        # Fix for DATETIME('now') FUNCTION - convert SQLite syntax to MySQL
-                        default_str = str(default_value).upper().replace('"', "'")
-                        if ("DATETIME('NOW')" in default_str or default_str == "DATETIME('NOW')" or 
-                            default_str == "'CURRENT_TIMESTAMP'" or default_str == "CURRENT_TIMESTAMP"):
-                            # For older MySQL/MariaDB versions, use TIMESTAMP instead of DATETIME with CURRENT_TIMESTAMP
-                            if mysql_type == "DATETIME":
-                                mysql_type = "TIMESTAMP"
-                            default_sql = " DEFAULT CURRENT_TIMESTAMP"
-                        # Handle 'NULL' string defaults
-                        elif str(default_value).upper() in ["'NULL'", "NULL"]:
-                            default_sql = " DEFAULT NULL"
-                        # Handle numeric defaults but check for TINYINT overflow
-                        elif isinstance(default_value, (int, float)) or str(default_value).replace('.', '').replace('-', '').isdigit():
-                            numeric_value = float(default_value)
-                            # Check for TINYINT overflow (range is -128 to 127, or 0 to 255 for unsigned)
-                            if "TINYINT" in mysql_type and (numeric_value > 127 or numeric_value < -128):
-                                print(f"Warning: Default value {default_value} for TINYINT column '{col_name}' exceeds TINYINT range. Converting column to SMALLINT.")
-                                mysql_type = mysql_type.replace("TINYINT", "SMALLINT")
-                            default_sql = f" DEFAULT {default_value}"
-                        # Specific handling for the 'api_key' table's timestamps if they need app management
-                        elif table_name == 'api_key' and col_name in ['created_at', 'updated_at']:
-                            # Skip default for 'created_at' as we'll populate it in INSERT
-                            # 'updated_at' will get ON UPDATE CURRENT_TIMESTAMP, not a DEFAULT
-                            pass
-                        elif isinstance(default_value, str):
-                            # Handle string defaults for VARCHAR, DATE, TIME, and TEXT types (on MariaDB)
-                            # Note: TEXT/LONGTEXT would have been skipped above on MySQL
-                            default_value_clean = default_value.strip("'\"")
-                            default_sql = f" DEFAULT '{default_value_clean}'"
-                        else:
-                            default_sql = f" DEFAULT {default_value}"
+                        default_sql = f" DEFAULT {default_value}"
                 
                 # Add ON UPDATE CURRENT_TIMESTAMP specifically for 'updated_at' column in api_key table
                 on_update_clause = ""
@@ -289,14 +1033,21 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
                         default_sql = " DEFAULT CURRENT_TIMESTAMP"
 
 
+                mysql_types[col_name] = mysql_type
                 col_defs.append(f"`{col_name}` {mysql_type}{not_null_sql}{default_sql}{auto_increment}{on_update_clause}".strip())
                 if pk == 1:
                     primary_keys.append(f"`{col_name}`")
                 
-                # Add UNIQUE constraint if the column was found to be unique
+                # Add UNIQUE constraint if the column was found to be unique.
+                # It is created after the bulk load so InnoDB doesn't maintain it row by row.
                 if is_unique_col and col_name not in pk_col_names: # Don't add UNIQUE if it's already PK (PK implies unique)
-                    col_defs.append(f"UNIQUE (`{col_name}`)")
+                    unique_indexes.append(f"UNIQUE `{col_name}` (`{col_name}`)")
 
+            # Non-unique indexes are also deferred; TEXT, BLOB and long VARCHAR
+            # columns are indexed by a prefix
+            for index_name, index_cols in indexes_by_table.get(table_name, {}).items():
+                index_parts = [index_key_part(col, mysql_types.get(col, "")) for col in index_cols]
+                secondary_indexes.append(f"INDEX `{index_name}` ({', '.join(index_parts)})")
 
             if primary_keys:
                 col_defs.append(f"PRIMARY KEY ({', '.join(primary_keys)})")
@@ -314,86 +1065,48 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
 
             print(f"Generated CREATE TABLE statement:\n{create_stmt}")
 
+            pk_col_list = [col[1] for col in columns if col[5] == 1] # In column order, unlike pk_col_names
+            # Rows above MAX(pk) can only be found cheaply for a single integer key.
+            # Other tables are emptied and copied again, since without a single key
+            # INSERT IGNORE cannot tell copied rows apart. UNIQUE indexes left by the
+            # previous run are kept and checked while the rows are loaded.
+            resume_key = None
+            if resume and sum(1 for col in columns if col[5]) == 1 and "INT" in mysql_types[pk_col_list[0]]:
+                resume_key = pk_col_list[0]
+
             try:
-                mysql_cursor.execute(f"DROP TABLE IF EXISTS {escaped_table_name};")
+                if not resume:
+                    mysql_cursor.execute(f"DROP TABLE IF EXISTS {escaped_table_name};")
                 mysql_cursor.execute(create_stmt)
                 print(f"Table `{table_name}` created in MySQL.")
+                if resume_key:
+                    print(f"Resume mode: keeping existing data in `{table_name}`.")
+                elif resume:
+                    mysql_cursor.execute(f"TRUNCATE TABLE {escaped_table_name};")
+                    print(f"Resume mode: `{table_name}` has no single integer primary key, reloading it from scratch.")
             except mysql.connector.Error as err:
                 print(f"Error creating table `{table_name}`: {err}")
+                failed_tables.append(table_name)
                 continue
 
-            # Handle reserved keywords in SQLite SELECT queries
-            if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-                sqlite_cursor.execute(f"SELECT * FROM `{table_name}`")
-            else:
-                sqlite_cursor.execute(f"SELECT * FROM {table_name}")
-            rows = sqlite_cursor.fetchall()
-            if rows:
-                # Get column names to construct a proper INSERT statement
-                if table_name.lower() in {'group', 'order', 'key', 'index', 'table'}:
-                    sqlite_cursor.execute(f"PRAGMA table_info(`{table_name}`);")
-                else:
-                    sqlite_cursor.execute(f"PRAGMA table_info({table_name});")
-                original_col_names = [col[1] for col in sqlite_cursor.fetchall()]
-
-                # Adjust original_col_names and data based on MySQL's schema changes
-                # For api_key, if 'created_at' is managed by app, we need to pass a value.
-                # If 'updated_at' is auto-updated ON UPDATE, we can omit it on INSERT,
-                # but providing NOW() is also fine and explicit.
-
-                processed_rows = []
-                for row_data in rows:
-                    new_row = list(row_data) # Convert tuple to list for modification
-                    
-                    # Handle timestamp conversion for knex_migrations table
-                    if table_name == 'knex_migrations' and len(new_row) >= 4:
-                        # Convert Unix timestamp to MySQL DATETIME format
-                        migration_time = new_row[3]  # migration_time column
-                        if migration_time and str(migration_time).isdigit():
-                            # Convert from milliseconds to seconds if needed
-                            timestamp_val = int(migration_time)
-                            if timestamp_val > 4000000000:  # If > year 2096, likely milliseconds
-                                timestamp_val = timestamp_val // 1000
-                            
-                            try:
-                                dt = datetime.fromtimestamp(timestamp_val)
-                                new_row[3] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            except (ValueError, OSError) as e:
-                                print(f"Warning: Could not convert timestamp {migration_time}: {e}")
-                                new_row[3] = None
-                    
-                    # Assume original 'created_at' and 'updated_at' are the last two columns if they exist.
-                    # This is a simplification; a robust solution would use original_col_names.
-                    
-                    processed_rows.append(tuple(new_row))
-
-                placeholders = ','.join(['%s'] * len(original_col_names))
-                # Use INSERT IGNORE to skip duplicate key errors and continue processing
-                insert_stmt = f"INSERT IGNORE INTO {escaped_table_name} ({','.join(f'`{col}`' for col in original_col_names)}) VALUES ({placeholders})"
-                print(f"Copying {len(rows)} rows to `{table_name}` using: {insert_stmt}")
-
-                batch_size = 1000
-                successful_batches = 0
-                for i in range(0, len(processed_rows), batch_size):
-                    batch = processed_rows[i:i + batch_size]
-                    
-                    try:
-                        mysql_cursor.executemany(insert_stmt, batch)
-                        mysql_conn.commit()
-                        successful_batches += 1
-                    except mysql.connector.Error as err:
-                        print(f"Error inserting data into `{table_name}` (batch {i//batch_size}, starting row {i}): {err}")
-                        mysql_conn.rollback()
-                        # Continue with next batch instead of breaking
-                        continue
-                
-                print(f"Successfully processed {successful_batches} batches out of {(len(processed_rows) + batch_size - 1) // batch_size} for table `{table_name}`")
-                print(f"Data copied to `{table_name}`.")
-            else:
-                print(f"No data to copy for table `{table_name}`.")
+            # Get column names to construct a proper INSERT statement,
+            # reusing the PRAGMA table_info result fetched for the schema
+            original_col_names = [col[1] for col in columns]
+
+            # Adjust original_col_names and data based on MySQL's schema changes
+            # For api_key, if 'created_at' is managed by app, we need to pass a value.
+            # If 'updated_at' is auto-updated ON UPDATE, we can omit it on INSERT,
+            # but providing NOW() is also fine and explicit.
+
+            tables_to_load.append((table_name, original_col_names, pk_col_list, unique_indexes, secondary_indexes,
+                                   resume_key))
+
+        failed_tables += load_tables_in_parallel(sqlite_db_path, mysql_config, tables_to_load, max_allowed_packet,
+                                                 workers, staging_dir)
 
     except Exception as e:
         print(f"An unexpected error occurred during migration: {e}")
+        migration_error = True
         if mysql_conn:
             mysql_conn.rollback()
 
@@ -415,6 +1128,15 @@ def migrate_sqlite_to_mysql(sqlite_db_path, mysql_config):
         if sqlite_conn:
             sqlite_conn.close()
         print("Database connections closed.")
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if failed_tables or migration_error:
+        failed_info = f" Failed tables: {', '.join(failed_tables)}." if failed_tables else ""
+        print(f"\nMIGRATION INCOMPLETE: errors occurred, check them above before using the MySQL database.{failed_info}")
+        return False
+    print("\nMigration completed successfully.")
+    return True
 
 
 # --- Configuration ---
@@ -426,11 +1148,16 @@ mysql_connection_config = {
     'database': 'mysqldatabase' ## database name
     # 'collation': 'utf8mb4_uca1400_ai_ci' ## Optional: override collation (default: utf8mb4_unicode_ci)
 }
+migration_workers = DEFAULT_WORKERS ## number of tables copied in parallel
+resume_migration = False ## True keeps existing tables and only copies rows missing in MySQL
 
 # --- Run the migration ---
 if __name__ == "__main__":
-    confirm = input(f"WARNING: This will drop and recreate tables in MySQL database '{mysql_connection_config['database']}'. Are you sure? (yes/no): ").lower()
+    action = "add missing rows to" if resume_migration else "drop and recreate"
+    confirm = input(f"WARNING: This will {action} tables in MySQL database '{mysql_connection_config['database']}'. Are you sure? (yes/no): ").lower()
     if confirm == 'yes':
-        migrate_sqlite_to_mysql(sqlite_database_file, mysql_connection_config)
+        if not migrate_sqlite_to_mysql(sqlite_database_file, mysql_connection_config, migration_workers,
+                                       resume_migration):
+            raise SystemExit(1)
     else:
         print("Migration cancelled by user.")
@@ -17,15 +17,26 @@ import sqlite3
 from datetime import datetime
 import os
 
+# Fake PNG header bytes used as status page icon data
+FAKE_PNG_HEADER = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR'
+
 def create_test_database(db_path='kuma.db'):
     # Remove existing database if it exists
     if os.path.exists(db_path):
         os.remove(db_path)
         print(f"Removed existing {db_path}")
     
-    conn = sqlite3.connect(db_path)
+    # Transactions are driven manually so all tables and seed data are
+    # written in a single transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
     print(f"Creating test database: {db_path}")
+    log_lines = [] # Progress messages, written in one go once the data is committed
+    # The database is rebuilt from scratch every run, so durability is not needed
+    cursor.execute("PRAGMA synchronous = OFF")
+    cursor.execute("PRAGMA journal_mode = MEMORY")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("BEGIN")
     
     # Table 1: Monitor table (typical Uptime Kuma structure)
     cursor.execute("""
@@ -45,15 +56,15 @@ def create_test_database(db_path='kuma.db'):
             keyword TEXT
         )
     """)
-    print("Created table: monitor")
+    log_lines.append("Created table: monitor")
     
-    # Insert test data for monitor
+    # Insert test data for monitor. Static seed rows are written as a single
+    # compound INSERT, so each table is parsed and stepped only once
     cursor.execute("""
         INSERT INTO monitor (name, active, type, url, method, interval, keyword)
-        VALUES 
-            ('Google DNS', 1, 'ping', '8.8.8.8', 'GET', 60, NULL),
-            ('Test Website', 1, 'http', 'https://example.com', 'GET', 120, 'Example Domain'),
-            ('API Endpoint', 0, 'http', 'https://api.test.com/health', 'POST', 300, 'ok')
+        VALUES ('Google DNS', 1, 'ping', '8.8.8.8', 'GET', 60, NULL),
+               ('Test Website', 1, 'http', 'https://example.com', 'GET', 120, 'Example Domain'),
+               ('API Endpoint', 0, 'http', 'https://api.test.com/health', 'POST', 300, 'ok')
     """)
     
     # Table 2: Heartbeat table (large dataset simulation)
@@ -68,20 +79,20 @@ def create_test_database(db_path='kuma.db'):
             important BOOLEAN DEFAULT 0
         )
     """)
-    print("Created table: heartbeat")
+    log_lines.append("Created table: heartbeat")
     
-    # Insert test data for heartbeat
-    for i in range(50):
-        cursor.execute("""
-            INSERT INTO heartbeat (monitor_id, status, msg, ping, important)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            (i % 3) + 1,  # Rotate between monitor IDs 1-3
-            1 if i % 4 != 0 else 0,  # Mostly up, some down
-            f'Test message {i} with special chars: <>&"\'',
-            round(10.5 + (i % 20), 2),  # Ping times
-            1 if i % 10 == 0 else 0  # Some important
-        ))
+    # Insert test data for heartbeat with one prepared statement
+    heartbeat_rows = [(
+        (i % 3) + 1,  # Rotate between monitor IDs 1-3
+        1 if i % 4 != 0 else 0,  # Mostly up, some down
+        f'Test message {i} with special chars: <>&"\'',
+        round(10.5 + (i % 20), 2),  # Ping times
+        1 if i % 10 == 0 else 0  # Some important
+    ) for i in range(50)]
+    cursor.executemany("""
+        INSERT INTO heartbeat (monitor_id, status, msg, ping, important)
+        VALUES (?, ?, ?, ?, ?)
+    """, heartbeat_rows)
     
     # Table 3: API Key table (UNIQUE constraints, VARCHAR index limit edge case)
     cursor.execute("""
@@ -95,15 +106,14 @@ def create_test_database(db_path='kuma.db'):
             is_active BOOLEAN DEFAULT 1
         )
     """)
-    print("Created table: api_key")
+    log_lines.append("Created table: api_key")
     
     # Insert test data for api_key
     cursor.execute("""
         INSERT INTO api_key (client_name, key_hash, permissions)
-        VALUES 
-            ('admin-client', 'hash_admin_12345', 'read,write,delete'),
-            ('readonly-client', 'hash_readonly_67890', 'read'),
-            ('test-client', 'hash_test_abcdef', 'read,write')
+        VALUES ('admin-client', 'hash_admin_12345', 'read,write,delete'),
+               ('readonly-client', 'hash_readonly_67890', 'read'),
+               ('test-client', 'hash_test_abcdef', 'read,write')
     """)
     
     # Table 4: Maintenance table (TIME data type edge case)
@@ -122,14 +132,13 @@ def create_test_database(db_path='kuma.db'):
             days_of_month TEXT
         )
     """)
-    print("Created table: maintenance")
+    log_lines.append("Created table: maintenance")
     
     # Insert test data for maintenance
     cursor.execute("""
         INSERT INTO maintenance (title, description, strategy, start_date, end_date, start_time, end_time, weekdays)
-        VALUES 
-            ('Weekly Backup', 'System backup window', 'recurring', '2024-01-01', '2024-12-31', '02:00:00', '04:00:00', 'Sunday'),
-            ('System Upgrade', 'Major system upgrade', 'single', '2024-06-15', '2024-06-15', '22:00:00', '23:59:59', NULL)
+        VALUES ('Weekly Backup', 'System backup window', 'recurring', '2024-01-01', '2024-12-31', '02:00:00', '04:00:00', 'Sunday'),
+               ('System Upgrade', 'Major system upgrade', 'single', '2024-06-15', '2024-06-15', '22:00:00', '23:59:59', NULL)
     """)
     
     # Table 5: Reserved keyword table (tests MySQL reserved word handling)
@@ -140,11 +149,9 @@ def create_test_database(db_path='kuma.db'):
             weight INTEGER DEFAULT 1000
         )
     """)
-    print("Created table: group (reserved keyword)")
+    log_lines.append("Created table: group (reserved keyword)")
     
-    cursor.execute("""
-        INSERT INTO `group` (name, weight) VALUES ('Server Group 1', 1000), ('Server Group 2', 2000)
-    """)
+    cursor.execute("INSERT INTO `group` (name, weight) VALUES ('Server Group 1', 1000), ('Server Group 2', 2000)")
     
     # Table 6: knex_migrations table (timestamp conversion edge case)
     cursor.execute("""
@@ -155,17 +162,18 @@ def create_test_database(db_path='kuma.db'):
             migration_time BIGINT
         )
     """)
-    print("Created table: knex_migrations")
+    log_lines.append("Created table: knex_migrations")
     
     # Insert with Unix timestamps (milliseconds)
     current_timestamp_ms = int(datetime.now().timestamp() * 1000)
-    cursor.execute("""
+    cursor.executemany("""
         INSERT INTO knex_migrations (name, batch, migration_time)
-        VALUES 
-            ('20231201_create_monitor.js', 1, ?),
-            ('20231202_create_heartbeat.js', 1, ?),
-            ('20231203_create_api_key.js', 2, ?)
-    """, (current_timestamp_ms - 86400000, current_timestamp_ms - 43200000, current_timestamp_ms))
+        VALUES (?, ?, ?)
+    """, [
+        ('20231201_create_monitor.js', 1, current_timestamp_ms - 86400000),
+        ('20231202_create_heartbeat.js', 1, current_timestamp_ms - 43200000),
+        ('20231203_create_api_key.js', 2, current_timestamp_ms),
+    ])
     
     # Table 7: Tag table (TEXT/LONGTEXT edge case)
     cursor.execute("""
@@ -176,14 +184,13 @@ def create_test_database(db_path='kuma.db'):
             description TEXT
         )
     """)
-    print("Created table: tag")
+    log_lines.append("Created table: tag")
     
     cursor.execute("""
         INSERT INTO tag (name, color, description)
-        VALUES 
-            ('production', '#FF0000', 'Production environment monitors'),
-            ('staging', '#00FF00', 'Staging environment monitors'),
-            ('development', '#0000FF', 'Development environment with very long description that might test TEXT field limits and ensure proper migration handling')
+        VALUES ('production', '#FF0000', 'Production environment monitors'),
+               ('staging', '#00FF00', 'Staging environment monitors'),
+               ('development', '#0000FF', 'Development environment with very long description that might test TEXT field limits and ensure proper migration handling')
     """)
     
     # Table 8: Notification table (JSON-like TEXT data)
@@ -197,14 +204,13 @@ def create_test_database(db_path='kuma.db'):
             is_default BOOLEAN DEFAULT 0
         )
     """)
-    print("Created table: notification")
+    log_lines.append("Created table: notification")
     
     cursor.execute("""
         INSERT INTO notification (name, config, active, user_id)
-        VALUES 
-            ('Email Alert', '{"type":"email","to":"admin@example.com","subject":"Alert"}', 1, 1),
-            ('Slack Webhook', '{"type":"slack","url":"https://hooks.slack.com/test","channel":"#alerts"}', 1, 1),
-            ('Discord', '{"type":"discord","webhookUrl":"https://discord.com/api/webhooks/test"}', 0, 2)
+        VALUES ('Email Alert', '{"type":"email","to":"admin@example.com","subject":"Alert"}', 1, 1),
+               ('Slack Webhook', '{"type":"slack","url":"https://hooks.slack.com/test","channel":"#alerts"}', 1, 1),
+               ('Discord', '{"type":"discord","webhookUrl":"https://discord.com/api/webhooks/test"}', 0, 2)
     """)
     
     # Table 9: Status page table (BLOB edge case - storing binary data)
@@ -221,15 +227,16 @@ def create_test_database(db_path='kuma.db'):
             domain_name_list TEXT
         )
     """)
-    print("Created table: status_page")
+    log_lines.append("Created table: status_page")
     
     # Insert with binary data
-    cursor.execute("""
+    cursor.executemany("""
         INSERT INTO status_page (slug, title, description, icon, theme)
-        VALUES 
-            ('main', 'Main Status Page', 'Public status page', ?, 'light'),
-            ('internal', 'Internal Status', 'Internal monitoring dashboard', NULL, 'dark')
-    """, (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR',))  # Fake PNG header bytes
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        ('main', 'Main Status Page', 'Public status page', FAKE_PNG_HEADER, 'light'),
+        ('internal', 'Internal Status', 'Internal monitoring dashboard', None, 'dark'),
+    ])
     
     # Table 10: Edge case numeric types
     cursor.execute("""
@@ -245,37 +252,32 @@ def create_test_database(db_path='kuma.db'):
             double_value DOUBLE DEFAULT 0.0
         )
     """)
-    print("Created table: metrics")
+    log_lines.append("Created table: metrics")
     
     cursor.execute("""
         INSERT INTO metrics (metric_name, tiny_value, small_value, medium_value, big_value, decimal_value, float_value, double_value)
-        VALUES 
-            ('cpu_usage', 85, 1024, 65536, 9223372036854775807, 99.99, 3.14159, 2.718281828),
-            ('memory_usage', 127, 32767, 8388607, 1234567890123456, 12345.67, 1.414, 1.732050808),
-            ('disk_usage', -128, -32768, -8388608, -9223372036854775808, -999.99, -2.71, -3.141592654)
+        VALUES ('cpu_usage', 85, 1024, 65536, 9223372036854775807, 99.99, 3.14159, 2.718281828),
+               ('memory_usage', 127, 32767, 8388607, 1234567890123456, 12345.67, 1.414, 1.732050808),
+               ('disk_usage', -128, -32768, -8388608, -9223372036854775808, -999.99, -2.71, -3.141592654)
     """)
     
-    # Commit and close
-    conn.commit()
-    conn.close()
+    cursor.execute("COMMIT")
     
-    print(f"\nTest database created successfully: {db_path}")
-    print("\nDatabase statistics:")
+    log_lines.append(f"\nTest database created successfully: {db_path}")
+    log_lines.append("\nDatabase statistics:")
     
-    # Reopen to show statistics
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Count the rows of every table with a single one-row query
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = cursor.fetchall()
+    tables = [table[0] for table in cursor.fetchall()]
     
-    print(f"Total tables: {len(tables)}")
-    for table in tables:
-        table_name = table[0]
-        cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-        count = cursor.fetchone()[0]
-        print(f"  - {table_name}: {count} rows")
+    log_lines.append(f"Total tables: {len(tables)}")
+    count_sql = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM `{table_name}`)" for table_name in tables)
+    cursor.execute(count_sql)
+    for table_name, count in zip(tables, cursor.fetchone()):
+        log_lines.append(f"  - {table_name}: {count} rows")
     
     conn.close()
+    print("\n".join(log_lines))
 
 if __name__ == "__main__":
     create_test_database()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test for multi-row INSERT batching using Mocking.
+"""
+
+import io
+import sys
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import migrate
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from migrate import (migrate_sqlite_to_mysql, compute_batch_size, estimate_row_bytes, _is_splittable_insert_error,
+                     MAX_PREPARED_PLACEHOLDERS)
+import mysql.connector
+from mysql.connector import errorcode
+import sqlite3
+
+class TestBatchInsert(unittest.TestCase):
+    row_count = 2500
+
+    def setUp(self):
+        # Create a SQLite DB with enough rows to span several batches
+        self.sqlite_db = 'test_batch_insert.db'
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+        conn = sqlite3.connect(self.sqlite_db)
+        cursor = conn.cursor()
+        cursor.execute("CREATE TABLE heartbeat (id INTEGER PRIMARY KEY, monitor_id INTEGER, msg TEXT)")
+        cursor.executemany(
+            "INSERT INTO heartbeat VALUES (?, ?, ?)",
+            [(i, i % 3, f'message {i:05d}') for i in range(10000, 10000 + self.row_count)]
+        )
+        conn.commit()
+        conn.close()
+
+        self.mysql_config = {
+            'host': 'localhost',
+            'user': 'root',
+            'password': '',
+            'database': 'test_db',
+        }
+
+    def tearDown(self):
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+    def run_migration(self, max_allowed_packet, execute_side_effect=None, resume_after=None):
+        with patch('mysql.connector.connect') as mock_connect:
+            mock_conn = MagicMock()
+            mock_cursor = MagicMock()
+            mock_connect.return_value = mock_conn
+            mock_conn.cursor.return_value = mock_cursor
+            # Answers both SELECT VERSION() and SHOW VARIABLES LIKE 'max_allowed_packet'
+            mock_cursor.fetchone.return_value = ('max_allowed_packet', str(max_allowed_packet))
+            mock_cursor.execute.side_effect = execute_side_effect
+            # Answers SELECT MAX(id) when resuming
+            mock_cursor.fetchall.return_value = [(resume_after,)]
+
+            migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config, resume=resume_after is not None)
+            self.executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+
+        return [call for call in mock_cursor.execute.call_args_list
+                if call.args[0].startswith("INSERT IGNORE INTO `heartbeat`")]
+
+    def test_rows_sent_as_multi_row_inserts(self):
+        inserts = self.run_migration(64 * 1024 * 1024)
+
+        # Batches fill up across SQLite fetches, so all rows fit in one statement
+        self.assertEqual(len(inserts), 1)
+        copied_ids = []
+        for call in inserts:
+            sql, params = call.args
+            rows_in_stmt = sql.count("(%s,%s,%s)")
+            self.assertEqual(len(params), rows_in_stmt * 3)
+            copied_ids.extend(params[0::3])
+        self.assertEqual(copied_ids, list(range(10000, 10000 + self.row_count)))
+
+    def test_small_packet_limits_rows_per_statement(self):
+        max_allowed_packet = 4096
+        inserts = self.run_migration(max_allowed_packet)
+
+        self.assertEqual(sum(call.args[0].count("(%s,%s,%s)") for call in inserts), self.row_count)
+        for call in inserts:
+            sql, params = call.args
+            rendered_values = sum(len(repr(p)) + 1 for p in params) + 3 * sql.count("(%s,%s,%s)")
+            self.assertLess(rendered_values, max_allowed_packet)
+
+    def test_resume_copies_only_missing_rows(self):
+        inserts = self.run_migration(64 * 1024 * 1024, resume_after=10000 + 1999)
+
+        self.assertFalse(any(sql.startswith("DROP TABLE") for sql in self.executed))
+        self.assertIn("SELECT MAX(`id`) FROM `heartbeat`", self.executed)
+        copied_ids = [value for call in inserts for value in call.args[1][0::3]]
+        self.assertEqual(copied_ids, list(range(10000 + 2000, 10000 + self.row_count)))
+        self.assertNotIn("TRUNCATE TABLE `heartbeat`;", self.executed)
+
+    def test_resume_reloads_tables_without_integer_key(self):
+        conn = sqlite3.connect(self.sqlite_db)
+        conn.execute("CREATE TABLE setting (key VARCHAR(200), value TEXT)")
+        conn.executemany("INSERT INTO setting VALUES (?, ?)", [('theme', 'dark'), ('theme', 'dark')])
+        conn.commit()
+        conn.close()
+
+        self.run_migration(64 * 1024 * 1024, resume_after=10000 + 1999)
+
+        # Copied rows cannot be told apart without a key, so the table starts over
+        truncate_position = self.executed.index("TRUNCATE TABLE `setting`;")
+        insert_position = next(i for i, sql in enumerate(self.executed)
+                               if sql.startswith("INSERT IGNORE INTO `setting`"))
+        self.assertLess(truncate_position, insert_position)
+        self.assertNotIn("SELECT MAX(`key`) FROM `setting`", self.executed)
+
+    def test_rows_read_in_primary_key_order(self):
+        conn = sqlite3.connect(self.sqlite_db)
+        conn.execute("CREATE TABLE tag (name VARCHAR(20) PRIMARY KEY, color TEXT)")
+        conn.executemany("INSERT INTO tag VALUES (?, ?)", [('zeta', 'red'), ('alpha', 'blue'), ('mu', 'green')])
+        conn.commit()
+        conn.close()
+
+        with patch('mysql.connector.connect') as mock_connect:
+            mock_cursor = MagicMock()
+            mock_connect.return_value.cursor.return_value = mock_cursor
+            migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config)
+
+        insert = next(call for call in mock_cursor.execute.call_args_list
+                      if call.args[0].startswith("INSERT IGNORE INTO `tag`"))
+        self.assertEqual(insert.args[1][0::2], [b'alpha', b'mu', b'zeta'])
+
+    def test_wide_rows_after_first_fetch_stay_within_packet(self):
+        max_allowed_packet = 64 * 1024
+        conn = sqlite3.connect(self.sqlite_db)
+        # Rows of the first fetch are short, later ones far wider than the estimate
+        conn.execute("CREATE TABLE incident (id INTEGER PRIMARY KEY, content TEXT)")
+        conn.executemany("INSERT INTO incident VALUES (?, ?)",
+                         [(i, 'x' * (2000 if i >= 1000 else 10)) for i in range(1200)])
+        conn.commit()
+        conn.close()
+
+        with patch('mysql.connector.connect') as mock_connect:
+            mock_cursor = MagicMock()
+            mock_connect.return_value.cursor.return_value = mock_cursor
+            mock_cursor.fetchone.return_value = ('max_allowed_packet', str(max_allowed_packet))
+            migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config)
+
+        inserts = [call.args[1] for call in mock_cursor.execute.call_args_list
+                   if call.args[0].startswith("INSERT IGNORE INTO `incident`")]
+        self.assertEqual(sum(len(params) for params in inserts) // 2, 1200)
+        for params in inserts:
+            self.assertLess(sum(len(repr(p)) + 1 for p in params), max_allowed_packet)
+
+    def test_oversized_packet_not_split(self):
+        self.assertFalse(_is_splittable_insert_error(
+            mysql.connector.OperationalError(msg="Got a packet bigger than 'max_allowed_packet' bytes",
+                                             errno=errorcode.ER_NET_PACKET_TOO_LARGE)))
+        self.assertTrue(_is_splittable_insert_error(mysql.connector.errors.get_mysql_exception(
+            errorcode.ER_DATA_TOO_LONG, "Data too long for column 'msg' at row 1", '22001')))
+        # The connector maps SQLSTATE HY000 errors to DatabaseError
+        self.assertFalse(_is_splittable_insert_error(mysql.connector.errors.get_mysql_exception(
+            errorcode.ER_TRUNCATED_WRONG_VALUE_FOR_FIELD, "Incorrect integer value", 'HY000')))
+
+    def test_worker_reconnects_after_losing_connection(self):
+        conn = sqlite3.connect(self.sqlite_db)
+        conn.execute("CREATE TABLE tag (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("INSERT INTO tag VALUES (1, 'production')")
+        conn.commit()
+        conn.close()
+        lost = mysql.connector.OperationalError(msg="Lost connection to MySQL server during query", errno=2013)
+
+        def drop_connection(sql, params=None):
+            if sql.startswith("INSERT IGNORE INTO `heartbeat`") or sql.startswith("ROLLBACK TO SAVEPOINT"):
+                raise lost
+
+        with patch('mysql.connector.connect') as mock_connect:
+            mock_conn = MagicMock()
+            mock_cursor = MagicMock()
+            mock_connect.return_value = mock_conn
+            mock_conn.cursor.return_value = mock_cursor
+            mock_conn.rollback.side_effect = lost
+            mock_cursor.execute.side_effect = drop_connection
+            result = migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config, workers=1)
+            connections = mock_connect.call_count
+
+        self.assertFalse(result)
+        # schema connection, the worker's first connection and its replacement
+        self.assertEqual(connections, 3)
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertTrue(any(sql.startswith("INSERT IGNORE INTO `tag`") for sql in executed))
+
+    def test_parallel_workers_print_each_table_together(self):
+        conn = sqlite3.connect(self.sqlite_db)
+        for table_name in ('tag', 'setting', 'incident'):
+            conn.execute(f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany(f"INSERT INTO {table_name} VALUES (?, ?)", [(i, f'{table_name} {i}') for i in range(500)])
+        conn.commit()
+        conn.close()
+
+        output = io.StringIO()
+        with patch('mysql.connector.connect') as mock_connect, redirect_stdout(output):
+            mock_connect.return_value.cursor.return_value = MagicMock()
+            migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config, workers=4)
+
+        for table_name in ('heartbeat', 'tag', 'setting', 'incident'):
+            with self.subTest(table_name=table_name):
+                self.assertRegex(output.getvalue(),
+                                 rf"Copying rows to `{table_name}` using: [^\n]*\n"
+                                 rf"Successfully processed [^\n]* for table `{table_name}` [^\n]*\n"
+                                 rf"Data copied to `{table_name}`\.\n")
+        self.assertLessEqual(output.getvalue().count("C extension not available"), 1)
+
+    def test_row_size_estimate(self):
+        # Lengths of text and binary values, fixed sizes for numbers and NULL
+        self.assertEqual(estimate_row_bytes((1, 2.5, None, b'abc', 'xy')), 5 + 3 + 8 + 8 + 4 + 3 + 2)
+
+    def test_rows_per_statement_within_placeholder_limit(self):
+        wide_row = tuple(range(40))
+        batch_size = compute_batch_size([wide_row], 1024 * 1024 * 1024)
+        self.assertEqual(batch_size, MAX_PREPARED_PLACEHOLDERS // len(wide_row))
+
+    def test_rejected_batch_is_split_to_skip_bad_rows(self):
+        bad_id = 10000 + 1234
+
+        def reject_bad_row(sql, params=None):
+            if sql.startswith("INSERT IGNORE") and bad_id in params[0::3]:
+                raise mysql.connector.errors.get_mysql_exception(
+                    errorcode.ER_DATA_TOO_LONG, "Data too long for column 'msg' at row 1", '22001')
+
+        inserts = self.run_migration(64 * 1024 * 1024, reject_bad_row)
+
+        copied_ids = set()
+        for call in inserts:
+            sql, params = call.args
+            if bad_id not in params[0::3]:
+                copied_ids.update(params[0::3])
+        self.assertEqual(copied_ids, set(range(10000, 10000 + self.row_count)) - {bad_id})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test for the LOAD DATA LOCAL INFILE copy path using Mocking.
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import migrate
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from migrate import migrate_sqlite_to_mysql, encode_load_data_value
+import sqlite3
+
+class TestEncodeLoadDataValue(unittest.TestCase):
+    def test_values(self):
+        cases = [
+            (None, b'\\N'),
+            (42, b'42'),
+            (1.5, b'1.5'),
+            ('plain', b'"plain"'),
+            ('say "hi"', b'"say \\"hi\\""'),
+            ('C:\\path', b'"C:\\\\path"'),
+            ('line1\nline2\r', b'"line1\\nline2\\r"'),
+            (b'\x00\xff', b'"\\0\xff"'),
+            ('caf\u00e9', b'"caf\xc3\xa9"'),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(encode_load_data_value(value), expected)
+
+class TestLoadDataInfile(unittest.TestCase):
+    def setUp(self):
+        self.sqlite_db = 'test_load_data.db'
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+        conn = sqlite3.connect(self.sqlite_db)
+        cursor = conn.cursor()
+        # Large enough to span several batches, so the data file path is used
+        cursor.execute("CREATE TABLE heartbeat (id INTEGER PRIMARY KEY, msg TEXT)")
+        cursor.executemany("INSERT INTO heartbeat VALUES (?, ?)",
+                           [(i, f'beat, "{i}"' if i % 2 else None) for i in range(60000)])
+        # A single batch is still sent as an INSERT
+        cursor.execute("CREATE TABLE setting (id INTEGER PRIMARY KEY, value TEXT)")
+        cursor.execute("INSERT INTO setting VALUES (1, 'on')")
+        conn.commit()
+        conn.close()
+
+        self.mysql_config = {
+            'host': 'localhost',
+            'user': 'root',
+            'password': '',
+            'database': 'test_db',
+        }
+
+    def tearDown(self):
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+    @patch('mysql.connector.connect')
+    def test_large_tables_loaded_from_data_file(self, mock_connect):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = ('local_infile', 'ON')
+
+        loaded_files = []
+        def read_data_file(sql, params=None):
+            if sql.startswith("LOAD DATA"):
+                with open(params[0], 'rb') as data_file:
+                    loaded_files.append((sql, data_file.read()))
+        mock_cursor.execute.side_effect = read_data_file
+
+        migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config)
+
+        self.assertEqual(len(loaded_files), 1)
+        sql, data = loaded_files[0]
+        self.assertIn("INTO TABLE `heartbeat`", sql)
+        self.assertTrue(sql.endswith("(`id`,`msg`)"))
+        lines = data.split(b'\n')
+        self.assertEqual(lines[-1], b'')
+        self.assertEqual(len(lines) - 1, 60000)
+        self.assertEqual(lines[0], b'0,\\N')
+        self.assertEqual(lines[1], b'1,"beat, \\"1\\""')
+
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertTrue(any(sql.startswith("INSERT IGNORE INTO `setting`") for sql in executed))
+        self.assertFalse(any(sql.startswith("INSERT IGNORE INTO `heartbeat`") for sql in executed))
+        # Data files are only readable from the migration's staging directory
+        staging_dir = mock_connect.call_args.kwargs['allow_local_infile_in_path']
+        self.assertFalse(os.path.exists(staging_dir))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the helpers deciding which DEFAULT values can be migrated.
+"""
+
+import sys
+import os
+import unittest
+
+# Add parent directory to path to import migrate
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from migrate import should_skip_default_for_mysql, _is_numeric_literal, unwrap_default_parens, _is_expression_default
+
+class TestSkipDefaultForMysql(unittest.TestCase):
+    def test_text_and_blob_types_skipped_on_mysql(self):
+        for mysql_type in ["LONGTEXT", "TEXT", "MEDIUMTEXT", "BLOB", "LONGBLOB", "JSON", "GEOMETRY"]:
+            with self.subTest(mysql_type=mysql_type):
+                self.assertTrue(should_skip_default_for_mysql(mysql_type, is_mysql=True))
+
+    def test_other_types_keep_defaults_on_mysql(self):
+        for mysql_type in ["VARCHAR(255)", "VARBINARY(191)", "INT UNSIGNED", "TINYINT(1)", "DECIMAL(10,2)", "DATETIME"]:
+            with self.subTest(mysql_type=mysql_type):
+                self.assertFalse(should_skip_default_for_mysql(mysql_type, is_mysql=True))
+
+    def test_mariadb_keeps_all_defaults(self):
+        for mysql_type in ["LONGTEXT", "BLOB", "VARCHAR(255)"]:
+            with self.subTest(mysql_type=mysql_type):
+                self.assertFalse(should_skip_default_for_mysql(mysql_type, is_mysql=False))
+
+class TestIsNumericLiteral(unittest.TestCase):
+    def test_numeric_literals(self):
+        for value in [0, 1.5, '0', '-128', '0.00', '+5', '1e3', '-2.5E-3']:
+            with self.subTest(value=value):
+                self.assertTrue(_is_numeric_literal(value))
+
+    def test_non_numeric_literals(self):
+        for value in ["'GET'", "'0'", 'CURRENT_TIMESTAMP', 'nan', 'inf', '', None, '1_000', '\u0661\u0662', ' 5', '1e999']:
+            with self.subTest(value=value):
+                self.assertFalse(_is_numeric_literal(value))
+
+class TestDefaultExpressions(unittest.TestCase):
+    def test_unwrap_default_parens(self):
+        cases = [
+            ('(0)', '0'),
+            ("(('GET'))", "'GET'"),
+            ("(strftime('%s','now'))", "strftime('%s','now')"),
+            ('(a) + (b)', '(a) + (b)'),
+            ("'(x)'", "'(x)'"),
+            (5, 5),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(unwrap_default_parens(value), expected)
+
+    def test_expression_defaults(self):
+        for value in ["strftime('%s','now')", "lower(hex(randomblob(16)))"]:
+            with self.subTest(value=value):
+                self.assertTrue(_is_expression_default(value))
+        for value in ["'(not an expression)'", "CURRENT_TIMESTAMP", '0', 0]:
+            with self.subTest(value=value):
+                self.assertFalse(_is_expression_default(value))
+
+if __name__ == '__main__':
+    unittest.main()
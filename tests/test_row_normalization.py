@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-table row fixups applied before inserting into MySQL.
+"""
+
+import sys
+import os
+import unittest
+from datetime import datetime
+
+# Add parent directory to path to import migrate
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from migrate import convert_knex_migration_time, normalize_rows
+
+class TestKnexMigrationTime(unittest.TestCase):
+    def test_seconds_and_milliseconds(self):
+        expected = datetime.fromtimestamp(1701388800).strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(convert_knex_migration_time(1701388800), expected)
+        self.assertEqual(convert_knex_migration_time(1701388800000), expected)
+        self.assertEqual(convert_knex_migration_time('1701388800000'), expected)
+        self.assertEqual(convert_knex_migration_time(b'1701388800000'), expected)
+
+    def test_non_numeric_values_unchanged(self):
+        self.assertIsNone(convert_knex_migration_time(None))
+        self.assertEqual(convert_knex_migration_time('2023-12-01 00:00:00'), '2023-12-01 00:00:00')
+
+class TestNormalizeRows(unittest.TestCase):
+    def test_knex_migrations_rows_converted(self):
+        rows = [(1, '20231201_create_monitor.js', 1, 1701388800000)]
+        normalized = normalize_rows('knex_migrations', rows)
+        expected = datetime.fromtimestamp(1701388800).strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(normalized, [(1, '20231201_create_monitor.js', 1, expected)])
+
+    def test_other_tables_returned_as_is(self):
+        rows = [(1, 'Google DNS', 1701388800000)]
+        self.assertIs(normalize_rows('monitor', rows), rows)
+
+if __name__ == '__main__':
+    unittest.main()
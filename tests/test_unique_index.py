@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test for single-column UNIQUE index detection using Mocking.
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import migrate
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from migrate import migrate_sqlite_to_mysql
+import mysql.connector
+from mysql.connector import errorcode
+import sqlite3
+
+class TestUniqueIndex(unittest.TestCase):
+    def setUp(self):
+        # Create a SQLite DB with single and composite UNIQUE constraints
+        self.sqlite_db = 'test_unique_index.db'
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+        conn = sqlite3.connect(self.sqlite_db)
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE api_key (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_name VARCHAR(191) NOT NULL UNIQUE,
+                key_hash VARCHAR(191) NOT NULL UNIQUE,
+                scope VARCHAR(50),
+                owner VARCHAR(50),
+                notes TEXT,
+                label VARCHAR(255),
+                UNIQUE (scope, owner)
+            )
+        """)
+        cursor.execute("CREATE INDEX api_key_owner_notes ON api_key (owner, notes)")
+        cursor.execute("CREATE INDEX api_key_lower_scope ON api_key (lower(scope))")
+        cursor.execute("CREATE INDEX api_key_label ON api_key (label)")
+        cursor.execute("INSERT INTO api_key (client_name, key_hash) VALUES ('admin', 'hash_admin')")
+        conn.commit()
+        conn.close()
+
+        self.mysql_config = {
+            'host': 'localhost',
+            'user': 'root',
+            'password': '',
+            'database': 'test_db',
+        }
+
+    def tearDown(self):
+        if os.path.exists(self.sqlite_db):
+            os.remove(self.sqlite_db)
+
+    @patch('mysql.connector.connect')
+    def test_single_column_unique_constraints(self, mock_connect):
+        # Setup the mock
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+
+        migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config)
+
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        create_stmt = next(sql for sql in executed if sql.startswith("CREATE TABLE IF NOT EXISTS `api_key`"))
+        unique_alter, index_alter = [sql for sql in executed if sql.startswith("ALTER TABLE `api_key`")]
+
+        # UNIQUE indexes are added after the data load, not in CREATE TABLE
+        self.assertNotIn("UNIQUE", create_stmt)
+        self.assertEqual(unique_alter,
+                         "ALTER TABLE `api_key` ADD UNIQUE `client_name` (`client_name`), ADD UNIQUE `key_hash` (`key_hash`);")
+        # Composite UNIQUE constraints are not treated as column-level UNIQUE
+        self.assertNotIn("`scope`", unique_alter + index_alter)
+        # Non-unique indexes are deferred too, in their own ALTER, with a
+        # prefix on TEXT and long VARCHAR columns
+        self.assertIn("ADD INDEX `api_key_owner_notes` (`owner`, `notes`(191))", index_alter)
+        self.assertIn("ADD INDEX `api_key_label` (`label`(191))", index_alter)
+        # Expression indexes are skipped
+        self.assertNotIn("api_key_lower_scope", index_alter)
+
+        # The ALTERs run after the rows are inserted
+        insert_position = next(i for i, sql in enumerate(executed) if sql.startswith("INSERT IGNORE INTO `api_key`"))
+        self.assertLess(insert_position, executed.index(unique_alter))
+
+    def run_with_duplicate_rows(self, rebuild_error=None):
+        def reject_unique_keys(sql, params=None):
+            if sql.startswith("ALTER TABLE `api_key` ADD UNIQUE"):
+                raise mysql.connector.IntegrityError(msg="Duplicate entry 'Admin' for key 'client_name'",
+                                                     errno=errorcode.ER_DUP_ENTRY)
+            if rebuild_error and sql.startswith("INSERT IGNORE INTO `api_key__rebuild`"):
+                raise rebuild_error
+
+        with patch('mysql.connector.connect') as mock_connect:
+            mock_cursor = MagicMock()
+            mock_connect.return_value.cursor.return_value = mock_cursor
+            mock_cursor.execute.side_effect = reject_unique_keys
+            mock_cursor.fetchone.return_value = (3,)
+            mock_cursor.rowcount = 2
+            result = migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config)
+        return result, [call.args[0] for call in mock_cursor.execute.call_args_list]
+
+    def test_duplicate_rows_dropped_by_rebuild(self):
+        result, executed = self.run_with_duplicate_rows()
+
+        self.assertTrue(result)
+        self.assertIn("CREATE TABLE `api_key__rebuild` LIKE `api_key`;", executed)
+        rebuild_alter = next(sql for sql in executed if sql.startswith("ALTER TABLE `api_key__rebuild`"))
+        self.assertIn("ADD UNIQUE `client_name` (`client_name`)", rebuild_alter)
+        self.assertIn("INSERT IGNORE INTO `api_key__rebuild` SELECT * FROM `api_key` ORDER BY `id`;", executed)
+        # Unique checks are never turned off, so the copy catches every duplicate
+        self.assertFalse(any("unique_checks" in sql for sql in executed))
+        self.assertIn("RENAME TABLE `api_key` TO `api_key__old`, `api_key__rebuild` TO `api_key`;", executed)
+
+    def test_failed_rebuild_fails_migration(self):
+        result, executed = self.run_with_duplicate_rows(
+            rebuild_error=mysql.connector.DatabaseError(msg="Lock wait timeout exceeded", errno=1205))
+
+        self.assertFalse(result)
+        self.assertFalse(any(sql.startswith("RENAME TABLE") for sql in executed))
+
+    @patch('mysql.connector.connect')
+    def test_resume_into_table_with_unique_key(self, mock_connect):
+        def unique_keys_exist(sql, params=None):
+            if sql.startswith("ALTER TABLE `api_key` ADD UNIQUE"):
+                raise mysql.connector.DatabaseError(msg="Duplicate key name 'client_name'",
+                                                    errno=errorcode.ER_DUP_KEYNAME)
+
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.execute.side_effect = unique_keys_exist
+        mock_cursor.fetchall.return_value = [(None,)]
+
+        self.assertTrue(migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config, resume=True))
+
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertFalse(any(sql.startswith("DROP TABLE") for sql in executed))
+        # Rows go into the existing table while its UNIQUE key is still enforced
+        self.assertTrue(any(sql.startswith("INSERT IGNORE INTO `api_key`") for sql in executed))
+        self.assertFalse(any("unique_checks" in sql for sql in executed))
+
+    @patch('mysql.connector.connect')
+    def test_failing_secondary_index_is_skipped(self, mock_connect):
+        def reject_label_index(sql, params=None):
+            if sql.startswith("ALTER TABLE `api_key`") and "`api_key_label`" in sql:
+                raise mysql.connector.DatabaseError(msg="Specified key was too long", errno=errorcode.ER_TOO_LONG_KEY)
+
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.execute.side_effect = reject_label_index
+
+        self.assertTrue(migrate_sqlite_to_mysql(self.sqlite_db, self.mysql_config))
+
+        executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertIn("ALTER TABLE `api_key` ADD UNIQUE `client_name` (`client_name`), ADD UNIQUE `key_hash` (`key_hash`);",
+                      executed)
+        # The other secondary index is still added on its own
+        self.assertIn("ALTER TABLE `api_key` ADD INDEX `api_key_owner_notes` (`owner`, `notes`(191));", executed)
+
+if __name__ == '__main__':
+    unittest.main()
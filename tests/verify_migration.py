@@ -6,6 +6,13 @@ Verifies the MySQL migration by checking tables, schemas, and data integrity.
 import mysql.connector
 from mysql.connector import Error
 
+# Tables created by create_test_db.py
+EXPECTED_TABLES = (
+    'monitor', 'heartbeat', 'api_key', 'maintenance', 
+    'group', 'knex_migrations', 'tag', 'notification', 
+    'status_page', 'metrics'
+)
+
 def verify_migration(mysql_config):
     """
     Verifies the migration by checking:
@@ -16,36 +23,44 @@ def verify_migration(mysql_config):
     """
     try:
         conn = mysql.connector.connect(**mysql_config)
-        cursor = conn.cursor()
+        # Buffered, so a query read with a single fetchone() never leaves
+        # unread rows behind for the next one
+        cursor = conn.cursor(buffered=True)
         print(f"Connected to MySQL database: {mysql_config['database']}")
         print("=" * 80)
         
-        # Get list of tables
-        cursor.execute("SHOW TABLES")
-        tables = [table[0] for table in cursor.fetchall()]
+        # Fetch the tables and their columns in one round trip
+        cursor.execute("""
+            SELECT table_name, column_name, column_type, column_key, extra
+            FROM information_schema.columns
+            WHERE table_schema = %s
+            ORDER BY table_name, ordinal_position
+        """, (mysql_config['database'],))
+        columns_by_table = {}
+        for table_name, col_name, col_type, key, extra in cursor:
+            columns_by_table.setdefault(table_name, []).append((col_name, col_type, key, extra))
+        tables = list(columns_by_table)
         print(f"\nFound {len(tables)} tables in MySQL:")
         print(f"   {', '.join(tables)}\n")
+        table_set = set(tables)
         
-        # Verify each table
-        expected_tables = [
-            'monitor', 'heartbeat', 'api_key', 'maintenance', 
-            'group', 'knex_migrations', 'tag', 'notification', 
-            'status_page', 'metrics'
-        ]
+        # Exact row counts of all present tables in one query
+        present_tables = [table for table in EXPECTED_TABLES if table in table_set]
+        row_counts = {}
+        if present_tables:
+            cursor.execute(" UNION ALL ".join(f"SELECT %s, COUNT(*) FROM `{table}`" for table in present_tables),
+                           present_tables)
+            row_counts = dict(cursor)
         
         print("Verifying tables:\n")
-        for table in expected_tables:
-            if table not in tables:
+        # Verify each table
+        for table in EXPECTED_TABLES:
+            if table not in table_set:
                 print(f"   Table '{table}' is MISSING!")
                 continue
             
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
-            count = cursor.fetchone()[0]
-            
-            # Get schema info
-            cursor.execute(f"DESCRIBE `{table}`")
-            columns = cursor.fetchall()
+            count = row_counts[table]
+            columns = columns_by_table.get(table, [])
             
             print(f"   Table: `{table}`")
             print(f"      - Rows: {count}")
@@ -54,8 +69,7 @@ def verify_migration(mysql_config):
             # Show column details for important tables
             if table in ['api_key', 'maintenance', 'metrics']:
                 print(f"      - Schema:")
-                for col in columns:
-                    col_name, col_type, null, key, default, extra = col
+                for col_name, col_type, key, extra in columns:
                     key_info = f" [{key}]" if key else ""
                     extra_info = f" {extra}" if extra else ""
                     print(f"        • {col_name}: {col_type}{key_info}{extra_info}")
@@ -69,47 +83,44 @@ def verify_migration(mysql_config):
         # 1. Check TIME data type in maintenance table
         print("1. TIME Data Type (maintenance table):")
         cursor.execute("SELECT title, start_time, end_time FROM maintenance")
-        for row in cursor.fetchall():
+        for row in cursor:
             print(f"   - {row[0]}: {row[1]} to {row[2]}")
         
         # 2. Check UNIQUE constraints on api_key
         print("\n2. UNIQUE Constraints (api_key table):")
         cursor.execute("SHOW INDEX FROM api_key WHERE Key_name != 'PRIMARY'")
-        indexes = cursor.fetchall()
-        for idx in indexes:
+        for idx in cursor:
             print(f"   - {idx[2]} on column: {idx[4]}")
         
         # 3. Check VARCHAR(191) for indexed columns
         print("\n3. VARCHAR Length for Indexed Columns:")
         for table in ['api_key', 'tag', 'status_page']:
-            cursor.execute(f"DESCRIBE `{table}`")
-            cols = cursor.fetchall()
-            for col in cols:
-                if 'VARCHAR(191)' in col[1]:
-                    print(f"   - `{table}`.`{col[0]}`: {col[1]} (Index-safe)")
+            for col_name, col_type, key, extra in columns_by_table.get(table, []):
+                if 'VARCHAR(191)' in col_type.upper():
+                    print(f"   - `{table}`.`{col_name}`: {col_type} (Index-safe)")
         
         # 4. Check BLOB data
         print("\n4. BLOB Data (status_page table):")
         cursor.execute("SELECT slug, icon IS NOT NULL as has_icon FROM status_page")
-        for row in cursor.fetchall():
+        for row in cursor:
             print(f"   - {row[0]}: {'Has icon data' if row[1] else 'No icon'}")
         
         # 5. Check numeric types in metrics table
         print("\n5. Numeric Types (metrics table):")
         cursor.execute("SELECT metric_name, tiny_value, big_value, decimal_value FROM metrics")
-        for row in cursor.fetchall():
+        for row in cursor:
             print(f"   - {row[0]}: tiny={row[1]}, big={row[2]}, decimal={row[3]}")
         
         # 6. Check reserved keyword table (group)
         print("\n6. Reserved Keyword Table (`group`):")
         cursor.execute("SELECT name, weight FROM `group`")
-        for row in cursor.fetchall():
+        for row in cursor:
             print(f"   - {row[0]}: weight={row[1]}")
         
         # 7. Check timestamp conversion in knex_migrations
         print("\n7. Timestamp Conversion (knex_migrations):")
         cursor.execute("SELECT name, migration_time FROM knex_migrations")
-        for row in cursor.fetchall():
+        for row in cursor:
             print(f"   - {row[0]}: {row[1]}")
         
         # 8. Check DATETIME fields with CURRENT_TIMESTAMP